@@ -1,4 +1,26 @@
+import contextlib
+import gc
+import heapq
+import itertools
+import os
+import pickle
+import random
+import sys
+import tempfile
+import time
+from array import array
+
+import numpy as np
+
+_NIL = -1  # ознака відсутності наступного слота у CompactLinkedList
+_SKIP_MAX_LEVEL = 32  # максимальна кількість експрес-смуг у SortedLinkedList
+_RUN_BLOCK = 4096  # кількість елементів в одному блоці файлу серії зовнішнього сортування
+_LINK_CHUNK = 1 << 20  # кількість індексів наступних слотів, що дописуються за раз у CompactLinkedList.extend
+_ARRAY_TYPECODES = "bBhHiIqQfd"  # числові коди модуля array з однаковим розміром на всіх платформах
+
 class Node:
+    __slots__ = ("data", "next")
+
     def __init__(self, data=None):
         """
         Ініціалізує вузол з заданими даними.
@@ -9,12 +31,185 @@ class Node:
         self.data = data
         self.next = None
 
+class IndexedNode(Node):
+    __slots__ = ("prev",)
+
+    def __init__(self, data=None):
+        """
+        Ініціалізує вузол індексованого списку з посиланням на попередній вузол.
+
+        Args:
+            data: Дані, які будуть збережені у вузлі.
+        """
+        super().__init__(data)
+        self.prev = None
+
 class LinkedList:
-    def __init__(self):
+    def __init__(self, indexed=False):
         """
         Ініціалізує порожній зв'язаний список.
+
+        Args:
+            indexed: Якщо True, список підтримує хеш-індекс "значення -> вузли" та
+                посилання на попередні вузли, тож search_element, delete_node та
+                insert_before працюють за O(1) у середньому. Дані мають бути хешованими.
+
+        Індекс не змінює результатів: як і у звичайному режимі, знаходиться і
+        видаляється перший з дублікатів у порядку списку. Після вставки дубліката на
+        початок чи всередину списку перший пошук цього значення один раз перебудовує
+        індекс за O(n), наступні знову працюють за O(1).
         """
         self.head = None
+        self.tail = None
+        self.size = 0
+        self._index = {} if indexed else None
+        # значення, порядок дублікатів яких в індексі може відрізнятися від порядку списку
+        self._unordered = set()
+
+    def __len__(self):
+        """
+        Повертає кількість вузлів у зв'язаному списку за O(1).
+        """
+        return self.size
+
+    def __iter__(self):
+        """
+        Ліниво повертає дані вузлів від початку до кінця списку без копіювання.
+        """
+        current = self.head
+        while current:
+            yield current.data
+            current = current.next
+
+    @classmethod
+    def from_iterable(cls, iterable, indexed=False):
+        """
+        Будує зв'язаний список з ітерованого об'єкта за один прохід.
+
+        Args:
+            iterable: Джерело даних для вузлів.
+            indexed: Чи створювати список в індексованому режимі.
+
+        Returns:
+            Новий зв'язаний список.
+        """
+        llist = cls(indexed=indexed)
+        llist.extend(iterable)
+        return llist
+
+    def extend(self, iterable):
+        """
+        Додає всі елементи ітерованого об'єкта в кінець списку за один прохід.
+
+        Args:
+            iterable: Джерело даних для нових вузлів.
+        """
+        new_node = self._new_node
+        indexed = self._index is not None
+        tail = self.tail
+        count = 0
+        for data in iterable:
+            node = new_node(data)
+            if tail is None:
+                self.head = node
+            else:
+                tail.next = node
+                if indexed:
+                    node.prev = tail
+            tail = node
+            count += 1
+        self.tail = tail
+        self.size += count
+
+    def to_list(self):
+        """
+        Повертає дані вузлів у вигляді списку Python.
+        """
+        return list(self)
+
+    def to_array(self, dtype=None):
+        """
+        Повертає дані вузлів у вигляді масиву NumPy.
+
+        Args:
+            dtype: Тип елементів масиву; якщо не задано, визначається NumPy.
+        """
+        if dtype is None:
+            return np.array(self.to_list())
+        return np.fromiter(self, dtype=dtype, count=self.size)
+
+    @property
+    def indexed(self):
+        """
+        Повертає True, якщо список працює в індексованому режимі.
+        """
+        return self._index is not None
+
+    def _new_node(self, data):
+        """
+        Створює вузол відповідного типу та реєструє його в індексі.
+
+        Args:
+            data: Дані нового вузла.
+
+        Returns:
+            Новий вузол.
+        """
+        if self._index is None:
+            return Node(data)
+        node = IndexedNode(data)
+        # словник як впорядкована множина: вставка та видалення вузла за O(1)
+        self._index.setdefault(data, {})[node] = None
+        return node
+
+    def _mark_unordered(self, node):
+        """
+        Позначає дані щойно вставленого не в кінець вузла, якщо серед вузлів з тими
+        самими даними його місце в індексі може не збігатися з місцем у списку.
+
+        Args:
+            node: Новий вузол.
+        """
+        if len(self._index[node.data]) > 1:
+            self._unordered.add(node.data)
+
+    def _unregister(self, node):
+        """
+        Видаляє вузол з індексу.
+
+        Args:
+            node: Вузол, який вилучається зі списку.
+        """
+        nodes = self._index[node.data]
+        del nodes[node]
+        if not nodes:
+            del self._index[node.data]
+
+    def _relink_prev(self):
+        """
+        Відновлює посилання на попередні вузли після перев'язування ланцюжка та
+        перебудовує індекс, щоб порядок дублікатів у ньому збігався з порядком списку.
+        """
+        index = {}
+        prev = None
+        current = self.head
+        while current:
+            current.prev = prev
+            index.setdefault(current.data, {})[current] = None
+            prev = current
+            current = current.next
+        self._index = index
+        self._unordered.clear()
+
+    def _clear(self):
+        """
+        Робить список порожнім після перенесення його вузлів до іншого списку.
+        """
+        self.head = self.tail = None
+        self.size = 0
+        if self._index is not None:
+            self._index = {}
+            self._unordered.clear()
 
     def insert_at_beginning(self, data):
         """
@@ -23,9 +218,15 @@ class LinkedList:
         Args:
             data: Дані, які будуть вставлені.
         """
-        new_node = Node(data)
+        new_node = self._new_node(data)
         new_node.next = self.head
+        if self._index is not None and self.head is not None:
+            self.head.prev = new_node
+            self._mark_unordered(new_node)
         self.head = new_node
+        if self.tail is None:
+            self.tail = new_node
+        self.size += 1
 
     def insert_at_end(self, data):
         """
@@ -34,17 +235,17 @@ class LinkedList:
         Args:
             data: Дані, які будуть вставлені.
         """
-        new_node = Node(data)
+        new_node = self._new_node(data)
         if self.head is None:
             self.head = new_node
         else:
-            cur = self.head
-            while cur.next:
-                cur = cur.next
-            cur.next = new_node
+            self.tail.next = new_node
+            if self._index is not None:
+                new_node.prev = self.tail
+        self.tail = new_node
+        self.size += 1
 
-    @staticmethod
-    def insert_after(prev_node: Node, data):
+    def insert_after(self, prev_node: Node, data):
         """
         Вставляє вузол з заданими даними після певного вузла.
 
@@ -55,9 +256,17 @@ class LinkedList:
         if prev_node is None:
             print("Попереднього вузла не існує.")
             return
-        new_node = Node(data)
+        new_node = self._new_node(data)
         new_node.next = prev_node.next
         prev_node.next = new_node
+        if self._index is not None:
+            new_node.prev = prev_node
+            if new_node.next is not None:
+                new_node.next.prev = new_node
+                self._mark_unordered(new_node)
+        if prev_node is self.tail:
+            self.tail = new_node
+        self.size += 1
 
     def insert_before(self, next_node: Node, data):
         """
@@ -71,48 +280,73 @@ class LinkedList:
             print("Наступного вузла не існує.")
             return
 
-        new_node = Node(data)
-
         if next_node is self.head:
-            new_node.next = self.head
-            self.head = new_node
+            self.insert_at_beginning(data)
             return
 
-        current = self.head
-        while current and current.next != next_node:
-            current = current.next
-        current.next = new_node
-        new_node.next = next_node
+        if self._index is not None:
+            current = next_node.prev
+        else:
+            current = self.head
+            while current and current.next is not next_node:
+                current = current.next
+        if current is None:
+            print("Вузол не належить списку.")
+            return
+        self.insert_after(current, data)
 
     def delete_node(self, key: int):
         """
         Видаляє вузол з заданими даними зі зв'язаного списку.
 
+        При дублікатах видаляється перший такий вузол у порядку списку.
+
         Args:
             key: Дані вузла, який слід видалити.
         """
-        cur = self.head
-        if cur and cur.data == key:
+        if self._index is not None:
+            cur = self.search_element(key)
+            if cur is None:
+                return
+            self._unregister(cur)
+            prev = cur.prev
+            if cur.next is not None:
+                cur.next.prev = prev
+        else:
+            cur = self.head
+            prev = None
+            while cur and cur.data != key:
+                prev = cur
+                cur = cur.next
+            if cur is None:
+                return
+
+        if prev is None:
             self.head = cur.next
-            return
-        prev = None
-        while cur and cur.data != key:
-            prev = cur
-            cur = cur.next
-        if cur is None:
-            return
-        prev.next = cur.next
+        else:
+            prev.next = cur.next
+        if cur is self.tail:
+            self.tail = prev
+        self.size -= 1
 
     def search_element(self, data: int) -> Node | None:
         """
         Шукає вузол з заданими даними у зв'язаному списку.
 
+        В індексованому режимі пошук виконується за O(1) у середньому (див. __init__);
+        при дублікатах повертається перший такий вузол у порядку списку.
+
         Args:
             data: Дані для пошуку.
 
         Returns:
             Вузол, що містить дані, якщо знайдено, в іншому випадку None.
         """
+        if self._index is not None:
+            if data in self._unordered:
+                self._relink_prev()
+            nodes = self._index.get(data)
+            return next(iter(nodes)) if nodes else None
         cur = self.head
         while cur:
             if cur.data == data:
@@ -124,10 +358,8 @@ class LinkedList:
         """
         Виводить елементи зв'язаного списку у консоль.
         """
-        current = self.head
-        while current:
-            print(current.data)
-            current = current.next
+        for data in self:
+            print(data)
 
     def reverse_list(self):
         """
@@ -135,12 +367,15 @@ class LinkedList:
         """
         prev = None
         current = self.head
+        self.tail = current
         while current:
             next_node = current.next
             current.next = prev
             prev = current
             current = next_node
         self.head = prev
+        if self._index is not None:
+            self._relink_prev()
 
     @staticmethod
     def get_middle(head):
@@ -165,72 +400,185 @@ class LinkedList:
 
         return slow
 
-    def merge_sorted_lists(self, left, right):
+    @staticmethod
+    def _split(head, count):
+        """
+        Відрізає від ланцюжка перші count вузлів.
+
+        Args:
+            head: Початковий вузол ланцюжка.
+            count: Кількість вузлів, що залишаються у першій частині.
+
+        Returns:
+            Початковий вузол решти ланцюжка або None.
+        """
+        for _ in range(count - 1):
+            if head is None:
+                return None
+            head = head.next
+        if head is None:
+            return None
+        rest = head.next
+        head.next = None
+        return rest
+
+    @staticmethod
+    def _merge_runs(left, right, key=None, reverse=False):
+        """
+        Ітеративно зливає два відсортованих ланцюжки, перев'язуючи наявні вузли.
+
+        Злиття стабільне: при рівних ключах першим іде вузол з left.
+
+        Args:
+            left: Початковий вузол першого відсортованого ланцюжка.
+            right: Початковий вузол другого відсортованого ланцюжка.
+            key: Функція, що обчислює ключ сортування з даних вузла.
+            reverse: Якщо True, ланцюжки впорядковані за спаданням.
+
+        Returns:
+            Кортеж (перший, останній) вузлів об'єднаного ланцюжка.
+        """
+        if left is None or right is None:
+            head = left or right
+            return head, LinkedList._find_tail(head)
+
+        dummy = Node()
+        tail = dummy
+        left_key = key(left.data) if key else left.data
+        right_key = key(right.data) if key else right.data
+
+        while True:
+            # правий вузол береться лише тоді, коли він строго передує лівому
+            if (left_key < right_key) if reverse else (right_key < left_key):
+                tail.next = right
+                tail = right
+                right = right.next
+                if right is None:
+                    tail.next = left
+                    break
+                right_key = key(right.data) if key else right.data
+            else:
+                tail.next = left
+                tail = left
+                left = left.next
+                if left is None:
+                    tail.next = right
+                    break
+                left_key = key(left.data) if key else left.data
+
+        while tail.next:
+            tail = tail.next
+        return dummy.next, tail
+
+    def merge_sorted_lists(self, left, right, key=None, reverse=False):
         """
         Об'єднує два відсортованих зв'язаних списки.
 
         Args:
             left: Початковий вузол першого відсортованого списку.
             right: Початковий вузол другого відсортованого списку.
+            key: Функція, що обчислює ключ сортування з даних вузла.
+            reverse: Якщо True, списки впорядковані за спаданням.
 
         Returns:
             Початковий вузол об'єднаного відсортованого списку.
         """
-        if not left:
-            return right
-        if not right:
-            return left
+        return self._merge_runs(left, right, key, reverse)[0]
 
-        if left.data <= right.data:
-            result = left
-            result.next = self.merge_sorted_lists(left.next, right)
-        else:
-            result = right
-            result.next = self.merge_sorted_lists(left, right.next)
-
-        return result
-
-    def merge_sort(self, head):
+    def merge_sort(self, head, key=None, reverse=False):
         """
         Сортує зв'язаний список за допомогою сортування злиттям.
 
         Args:
             head: Початковий вузол зв'язаного списку для сортування.
+            key: Функція, що обчислює ключ сортування з даних вузла.
+            reverse: Якщо True, сортує за спаданням.
 
         Returns:
             Початковий вузол відсортованого зв'язаного списку.
         """
-        if not head or not head.next:
-            return head
+        return self._merge_sort(head, key, reverse)[0]
 
-        middle = self.get_middle(head)
-        next_to_middle = middle.next
+    def _merge_sort(self, head, key=None, reverse=False):
+        """
+        Сортує ланцюжок ітеративним сортуванням злиттям (знизу вгору).
 
-        middle.next = None
+        На кожному проході ланцюжок ділиться на серії довжиною width, сусідні серії
+        зливаються, а width подвоюється. Рекурсії немає, додаткова пам'ять O(1).
 
-        left = self.merge_sort(head)
-        right = self.merge_sort(next_to_middle)
+        Args:
+            head: Початковий вузол зв'язаного списку для сортування.
+            key: Функція, що обчислює ключ сортування з даних вузла.
+            reverse: Якщо True, сортує за спаданням.
 
-        sorted_list = self.merge_sorted_lists(left, right)
+        Returns:
+            Кортеж (перший, останній) вузлів відсортованого зв'язаного списку.
+        """
+        if head is None or head.next is None:
+            return head, head
 
-        return sorted_list
+        dummy = Node()
+        dummy.next = head
+        width = 1
+        while True:
+            prev = dummy
+            current = dummy.next
+            merges = 0
+            while current:
+                left = current
+                right = self._split(left, width)
+                current = self._split(right, width)
+                merged_head, merged_tail = self._merge_runs(left, right, key, reverse)
+                prev.next = merged_head
+                prev = merged_tail
+                merges += 1
+            if merges <= 1:
+                return dummy.next, prev
+            width *= 2
 
-    def sort(self):
+    def sort(self, key=None, reverse=False):
         """
-        Сортує зв'язаний список.
+        Стабільно сортує зв'язаний список на місці, без створення нових вузлів.
+
+        Args:
+            key: Функція, що обчислює ключ сортування з даних вузла.
+            reverse: Якщо True, сортує за спаданням.
+        """
+        self.head, self.tail = self._merge_sort(self.head, key, reverse)
+        if self._index is not None:
+            self._relink_prev()
+
+    @staticmethod
+    def _find_tail(head):
+        """
+        Знаходить останній вузол ланцюжка, що починається з head.
+
+        Args:
+            head: Початковий вузол ланцюжка.
+
+        Returns:
+            Останній вузол або None, якщо ланцюжок порожній.
         """
-        self.head = self.merge_sort(self.head)
+        if head is None:
+            return None
+        while head.next:
+            head = head.next
+        return head
 
 def merge_sorted_linked_lists(list1, list2):
     """
     Об'єднує два відсортованих зв'язаних списки в один відсортований зв'язаний список.
 
+    Вузли не копіюються, а переносяться в результат, тому обидва вхідні списки
+    після виклику стають порожніми. При рівних значеннях першим іде вузол з list1.
+    Результат індексований, якщо індексовані обидва вхідні списки.
+
     Args:
         list1: Перший відсортований зв'язаний список.
         list2: Другий відсортований зв'язаний список.
 
     Returns:
-        Початковий вузол об'єднаного відсортованого зв'язаного списку.
+        Новий зв'язаний список, що містить усі вузли обох списків у відсортованому порядку.
     """
     dummy = Node(0)
     tail = dummy
@@ -238,7 +586,7 @@ def merge_sorted_linked_lists(list1, list2):
     head2 = list2.head
 
     while head1 and head2:
-        if head1.data < head2.data:
+        if head1.data <= head2.data:
             tail.next = head1
             head1 = head1.next
         else:
@@ -246,12 +594,997 @@ def merge_sorted_linked_lists(list1, list2):
             head2 = head2.next
         tail = tail.next
 
-    tail.next = head1 or head2
+    if head1:
+        tail.next = head1
+        tail = list1.tail
+    elif head2:
+        tail.next = head2
+        tail = list2.tail
+
+    merged = LinkedList(indexed=list1.indexed and list2.indexed)
+    merged.head = dummy.next
+    merged.tail = tail if merged.head else None
+    merged.size = list1.size + list2.size
+    if merged.indexed:
+        merged._relink_prev()
+
+    list1._clear()
+    list2._clear()
+
+    return merged
+
+
+def _iter_nodes(head):
+    """
+    Генератор вузлів ланцюжка, що запам'ятовує наступний вузол до передачі поточного.
+
+    Завдяки цьому споживач може перев'язувати отримані вузли під час обходу.
+
+    Args:
+        head: Початковий вузол ланцюжка.
+    """
+    while head is not None:
+        node = head
+        head = head.next
+        yield node
+
+
+def iter_merge_sorted(sources, key=None, reverse=False):
+    """
+    Ліниво зливає K відсортованих джерел за допомогою купи за O(N log K).
+
+    Джерела не змінюються; генератори читаються поступово, тож їх не потрібно
+    повністю завантажувати в пам'ять. Злиття стабільне: при рівних ключах першим
+    іде елемент із джерела з меншим номером.
+
+    Args:
+        sources: Послідовність LinkedList або ітерованих об'єктів, відсортованих за key.
+        key: Функція, що обчислює ключ порівняння зі значення.
+        reverse: Якщо True, джерела впорядковані за спаданням.
+
+    Returns:
+        Генератор значень в об'єднаному відсортованому порядку.
+    """
+    return heapq.merge(*sources, key=key, reverse=reverse)
+
+
+def merge_k_sorted_linked_lists(sources, key=None, reverse=False):
+    """
+    Об'єднує K відсортованих джерел в один відсортований зв'язаний список за O(N log K).
+
+    Вузли вхідних LinkedList переносяться в результат без копіювання (ці списки стають
+    порожніми), а для значень з інших ітерованих об'єктів створюються нові вузли.
+    Результат індексований, якщо всі джерела є індексованими LinkedList.
+
+    Args:
+        sources: Послідовність LinkedList або ітерованих об'єктів, відсортованих за key.
+        key: Функція, що обчислює ключ порівняння зі значення.
+        reverse: Якщо True, джерела впорядковані за спаданням.
+
+    Returns:
+        Новий зв'язаний список з усіма елементами у відсортованому порядку.
+    """
+    sources = list(sources)
+    indexed = bool(sources) and all(
+        isinstance(source, LinkedList) and source.indexed for source in sources
+    )
+    node_iters = [
+        _iter_nodes(source.head) if isinstance(source, LinkedList)
+        else (Node(data) for data in source)
+        for source in sources
+    ]
+    node_key = (lambda node: node.data) if key is None else (lambda node: key(node.data))
+
+    merged = LinkedList(indexed=indexed)
+    dummy = Node()
+    tail = dummy
+    size = 0
+    for node in heapq.merge(*node_iters, key=node_key, reverse=reverse):
+        tail.next = node
+        tail = node
+        size += 1
+    tail.next = None
+
+    merged.head = dummy.next
+    merged.tail = tail if size else None
+    merged.size = size
+
+    for source in sources:
+        if isinstance(source, LinkedList):
+            source._clear()
+    if indexed:
+        merged._relink_prev()
+
+    return merged
+
+
+class _Lane:
+    __slots__ = ("key", "node", "next", "down")
+
+    def __init__(self, key=None, node=None, down=None):
+        """
+        Ініціалізує елемент експрес-смуги списку з пропусками.
+
+        Args:
+            key: Ключ вузла, над яким стоїть елемент.
+            node: Вузол основного ланцюжка (None для заголовка смуги).
+            down: Елемент нижчої смуги для того самого вузла.
+        """
+        self.key = key
+        self.node = node
+        self.next = None
+        self.down = down
+
+
+class SortedLinkedList(LinkedList):
+    """
+    Відсортований зв'язаний список з імовірнісними експрес-смугами (skip list).
+
+    Над звичайним ланцюжком вузлів будуються рівні смуг, кожна з яких пропускає
+    в середньому половину елементів нижчого рівня. Пошук, впорядкована вставка,
+    видалення та вибірка діапазону виконуються в середньому за O(log n).
+    Довільні позиційні вставки та реверсування не підтримуються, бо порушують порядок.
+    """
+
+    def __init__(self, key=None, seed=None):
+        """
+        Ініціалізує порожній відсортований список.
+
+        Args:
+            key: Функція, що обчислює ключ упорядкування з даних вузла.
+            seed: Початкове значення генератора висот смуг.
+        """
+        super().__init__()
+        self.key = key
+        self._lanes = []
+        self._random = random.Random(seed)
+
+    @classmethod
+    def from_iterable(cls, iterable, key=None, seed=None):
+        """
+        Будує відсортований список з ітерованого об'єкта.
+
+        Args:
+            iterable: Джерело даних для вузлів.
+            key: Функція, що обчислює ключ упорядкування з даних вузла.
+            seed: Початкове значення генератора висот смуг.
+
+        Returns:
+            Новий SortedLinkedList.
+        """
+        llist = cls(key=key, seed=seed)
+        llist.extend(iterable)
+        return llist
+
+    def _clear(self):
+        """
+        Робить список порожнім разом з експрес-смугами.
+        """
+        super()._clear()
+        self._lanes = []
+
+    def _key(self, data):
+        """
+        Обчислює ключ упорядкування для даних.
+        """
+        return data if self.key is None else self.key(data)
+
+    def _random_height(self):
+        """
+        Повертає кількість експрес-смуг для нового вузла (геометричний розподіл, p = 1/2).
+        """
+        height = 0
+        while height < _SKIP_MAX_LEVEL and self._random.random() < 0.5:
+            height += 1
+        return height
+
+    def _add_lane(self):
+        """
+        Додає новий верхній рівень смуг і повертає його заголовок.
+        """
+        header = _Lane(down=self._lanes[-1] if self._lanes else None)
+        self._lanes.append(header)
+        return header
+
+    def _build_lanes(self):
+        """
+        Перебудовує всі експрес-смуги над уже відсортованим ланцюжком за O(n).
+        """
+        self._lanes = []
+        tails = []
+        for node in _iter_nodes(self.head):
+            height = self._random_height()
+            if not height:
+                continue
+            key = self._key(node.data)
+            down = None
+            for level in range(height):
+                if level == len(tails):
+                    tails.append(self._add_lane())
+                lane = _Lane(key, node, down)
+                tails[level].next = lane
+                tails[level] = lane
+                down = lane
+
+    def _find(self, key, inclusive=False):
+        """
+        Знаходить на кожному рівні останній елемент з ключем < key (або <= key).
+
+        Args:
+            key: Ключ для пошуку.
+            inclusive: Якщо True, шукається позиція після всіх рівних ключів.
+
+        Returns:
+            Кортеж (елементи смуг по рівнях знизу вгору, попередній вузол ланцюжка або None).
+        """
+        update = [None] * len(self._lanes)
+        entry = self._lanes[-1] if self._lanes else None
+        level = len(self._lanes) - 1
+        while entry is not None:
+            nxt = entry.next
+            while nxt is not None and (nxt.key <= key if inclusive else nxt.key < key):
+                entry = nxt
+                nxt = entry.next
+            update[level] = entry
+            entry = entry.down
+            level -= 1
+
+        pred = update[0].node if update else None
+        current = pred.next if pred is not None else self.head
+        while current is not None:
+            current_key = self._key(current.data)
+            if current_key > key or (current_key == key and not inclusive):
+                break
+            pred = current
+            current = current.next
+        return update, pred
+
+    def insert(self, data):
+        """
+        Вставляє дані, зберігаючи впорядкованість; рівні ключі йдуть у порядку вставки.
+
+        Args:
+            data: Дані, які будуть вставлені.
+
+        Returns:
+            Новий вузол.
+        """
+        key = self._key(data)
+        update, pred = self._find(key, inclusive=True)
+        if pred is None:
+            super().insert_at_beginning(data)
+            node = self.head
+        else:
+            super().insert_after(pred, data)
+            node = pred.next
+
+        down = None
+        for level in range(self._random_height()):
+            prev = update[level] if level < len(update) else self._add_lane()
+            lane = _Lane(key, node, down)
+            lane.next = prev.next
+            prev.next = lane
+            down = lane
+        return node
+
+    def extend(self, iterable):
+        """
+        Додає всі елементи ітерованого об'єкта: дописує їх, пересортовує ланцюжок
+        і перебудовує смуги за O((n + m) log(n + m)).
+
+        Args:
+            iterable: Джерело даних для нових вузлів.
+        """
+        super().extend(iterable)
+        self.sort()
+
+    def search_element(self, data):
+        """
+        Шукає вузол з заданими даними за O(log n) у середньому.
+
+        Args:
+            data: Дані для пошуку.
+
+        Returns:
+            Перший вузол, що містить дані, якщо знайдено, в іншому випадку None.
+        """
+        key = self._key(data)
+        _, pred = self._find(key)
+        current = pred.next if pred is not None else self.head
+        while current is not None and self._key(current.data) == key:
+            if current.data == data:
+                return current
+            current = current.next
+        return None
+
+    def delete_node(self, key: int):
+        """
+        Видаляє перший вузол з заданими даними за O(log n) у середньому.
+
+        Args:
+            key: Дані вузла, який слід видалити.
+        """
+        order_key = self._key(key)
+        update, prev = self._find(order_key)
+        target = prev.next if prev is not None else self.head
+        while target is not None and self._key(target.data) == order_key and target.data != key:
+            prev = target
+            target = target.next
+        if target is None or target.data != key:
+            return
+
+        for entry in update:
+            while entry.next is not None and entry.next.key == order_key and entry.next.node is not target:
+                entry = entry.next
+            if entry.next is not None and entry.next.node is target:
+                entry.next = entry.next.next
+        while self._lanes and self._lanes[-1].next is None:
+            self._lanes.pop()
+
+        if prev is None:
+            self.head = target.next
+        else:
+            prev.next = target.next
+        if target is self.tail:
+            self.tail = prev
+        self.size -= 1
+
+    def range(self, lo, hi):
+        """
+        Ліниво повертає дані з ключами lo <= key < hi.
+
+        Args:
+            lo: Нижня межа ключа (включно).
+            hi: Верхня межа ключа (не включно).
+        """
+        _, pred = self._find(lo)
+        current = pred.next if pred is not None else self.head
+        while current is not None and self._key(current.data) < hi:
+            yield current.data
+            current = current.next
+
+    def sort(self, key=None, reverse=False):
+        """
+        Пересортовує ланцюжок (за новим key, якщо його задано) і перебудовує смуги.
+
+        Args:
+            key: Нова функція ключа упорядкування.
+            reverse: Не підтримується: список завжди впорядкований за зростанням.
+
+        Raises:
+            ValueError: Якщо reverse=True.
+        """
+        if reverse:
+            raise ValueError("SortedLinkedList завжди впорядкований за зростанням.")
+        if key is not None:
+            self.key = key
+        super().sort(key=self.key)
+        self._build_lanes()
+
+    def _unsupported(self, *args, **kwargs):
+        """
+        Позиційні вставки та реверсування порушили б порядок відсортованого списку.
+
+        Raises:
+            TypeError: Завжди.
+        """
+        raise TypeError("Для SortedLinkedList використовуйте insert().")
+
+    insert_at_beginning = insert_at_end = insert_after = insert_before = _unsupported
+    reverse_list = _unsupported
+
+
+def benchmark_sorted(sizes=(1_000, 10_000, 100_000), operations=1_000, seed=42):
+    """
+    Порівнює SortedLinkedList зі звичайним LinkedList на змішаному навантаженні:
+    80% пошуків, 10% вставок і 10% видалень.
+
+    Args:
+        sizes: Розміри списків для вимірювань.
+        operations: Кількість операцій на один розмір.
+        seed: Початкове значення генератора випадкових чисел.
+    """
+    rng = random.Random(seed)
+    print(f"{'N':>10} {'LinkedList, мкс/оп':>20} {'SortedLinkedList, мкс/оп':>26}")
+    for size in sizes:
+        values = rng.sample(range(size * 10), size)
+        workload = []
+        for _ in range(operations):
+            roll = rng.random()
+            kind = "search" if roll < 0.8 else "insert" if roll < 0.9 else "delete"
+            workload.append((kind, rng.randrange(size * 10)))
+
+        timings = []
+        for llist in (LinkedList.from_iterable(values), SortedLinkedList.from_iterable(values, seed=seed)):
+            insert = llist.insert if isinstance(llist, SortedLinkedList) else llist.insert_at_end
+            start = time.perf_counter()
+            for kind, value in workload:
+                if kind == "search":
+                    llist.search_element(value)
+                elif kind == "insert":
+                    insert(value)
+                else:
+                    llist.delete_node(value)
+            timings.append((time.perf_counter() - start) * 1e6 / operations)
+        print(f"{size:>10} {timings[0]:>20.1f} {timings[1]:>26.1f}")
+
+
+def _write_run(path, values, typecode, block_items):
+    """
+    Записує відсортовану серію у файл у компактному двійковому форматі.
+
+    Числа з typecode записуються як сирі масиви array; довільні об'єкти - блоками pickle.
+
+    Args:
+        path: Шлях до файлу серії.
+        values: Ітерований об'єкт зі значеннями серії.
+        typecode: Код типу для модуля array або None для pickle.
+        block_items: Максимальна кількість елементів в одному блоці pickle.
+    """
+    with open(path, "wb") as file:
+        iterator = iter(values)
+        while True:
+            block = list(itertools.islice(iterator, block_items))
+            if not block:
+                break
+            if typecode is None:
+                pickle.dump(block, file, protocol=pickle.HIGHEST_PROTOCOL)
+            else:
+                array(typecode, block).tofile(file)
+
+
+def _read_run(file, typecode, block_items):
+    """
+    Потоково читає серію, збережену _write_run, невеликими блоками.
+
+    Args:
+        file: Відкритий у двійковому режимі файл серії.
+        typecode: Код типу для модуля array або None для pickle.
+        block_items: Кількість чисел, що зчитуються за раз (для typecode). Блоки pickle
+            читаються такими, якими їх записав _write_run.
+    """
+    if typecode is None:
+        while True:
+            try:
+                block = pickle.load(file)
+            except EOFError:
+                return
+            yield from block
+    else:
+        block_bytes = block_items * array(typecode).itemsize
+        while True:
+            data = file.read(block_bytes)
+            if not data:
+                return
+            block = array(typecode)
+            block.frombytes(data)
+            yield from block
+
+
+def _merge_runs(paths, typecode, block_items, key, reverse):
+    """
+    Потоково зливає файли серій, тримаючи в пам'яті по одному блоку з кожної.
+
+    Args:
+        paths: Шляхи до файлів серій.
+        typecode: Код типу для модуля array або None для pickle.
+        block_items: Розмір блоку читання серії.
+        key: Функція, що обчислює ключ сортування зі значення.
+        reverse: Якщо True, серії впорядковані за спаданням.
+    """
+    with contextlib.ExitStack() as stack:
+        readers = [
+            _read_run(stack.enter_context(open(path, "rb")), typecode, block_items)
+            for path in paths
+        ]
+        yield from iter_merge_sorted(readers, key=key, reverse=reverse)
+
+
+def external_sort(iterable, max_items=1_000_000, key=None, reverse=False, typecode=None, tmpdir=None):
+    """
+    Зовнішнє сортування даних, що не вміщуються в пам'ять.
+
+    Вхідні дані читаються блоками по max_items елементів, кожен блок сортується через
+    LinkedList.sort і скидається у тимчасовий файл як відсортована серія. Потім серії
+    потоково зливаються через iter_merge_sorted. Якщо всі дані вмістилися в один блок,
+    диск не використовується. Щоб отримати результат як зв'язаний список, передайте
+    генератор у LinkedList.from_iterable.
+
+    Серії записуються і читаються блоками по block_items = min(_RUN_BLOCK, max_items // 2)
+    елементів, а за один прохід зливається не більше max_items // block_items серій.
+    Якщо серій більше, їх групи попередньо зливаються у довші серії на диску (кожен
+    такий прохід ще раз читає і записує всі дані), тож і під час злиття в пам'яті
+    одночасно перебуває не більше приблизно max_items елементів.
+
+    Args:
+        iterable: Джерело даних.
+        max_items: Максимальна кількість елементів, що одночасно зберігаються в пам'яті.
+        key: Функція, що обчислює ключ сортування зі значення.
+        reverse: Якщо True, сортує за спаданням.
+        typecode: Код типу модуля array для числових даних ("q", "d" тощо); серії тоді
+            зберігаються як сирі масиви. Якщо None, використовується pickle.
+        tmpdir: Каталог для тимчасових файлів (за замовчуванням - системний).
+
+    Returns:
+        Генератор значень у відсортованому порядку.
+    """
+    if max_items < 1:
+        raise ValueError("max_items має бути додатним")
+
+    block_items = max(1, min(_RUN_BLOCK, max_items // 2))
+    fan_in = max(2, max_items // block_items)
+    iterator = iter(iterable)
+    with tempfile.TemporaryDirectory(prefix="extsort-", dir=tmpdir) as directory:
+        names = (os.path.join(directory, f"run-{number}.bin") for number in itertools.count())
+        runs = []
+        while True:
+            chunk = LinkedList.from_iterable(itertools.islice(iterator, max_items))
+            if not chunk:
+                break
+            chunk.sort(key=key, reverse=reverse)
+            if not runs and len(chunk) < max_items:
+                yield from chunk
+                return
+            path = next(names)
+            _write_run(path, chunk, typecode, block_items)
+            runs.append(path)
+            # звільняємо вузли до читання наступного блоку
+            del chunk
+
+        # багатопрохідне злиття: групи по fan_in серій зливаються, доки серій не стане досить мало
+        while len(runs) > fan_in:
+            merged = []
+            for start in range(0, len(runs), fan_in):
+                group = runs[start:start + fan_in]
+                if len(group) == 1:
+                    merged.extend(group)
+                    continue
+                path = next(names)
+                _write_run(path, _merge_runs(group, typecode, block_items, key, reverse), typecode, block_items)
+                for old_path in group:
+                    os.remove(old_path)
+                merged.append(path)
+            runs = merged
+
+        yield from _merge_runs(runs, typecode, block_items, key, reverse)
+
+
+class CompactLinkedList:
+    """
+    Компактний однозв'язний список у форматі "структура масивів".
+
+    Замість окремого об'єкта Node для кожного елемента значення та індекси наступних
+    елементів зберігаються у типізованих масивах array, а вузол адресується номером
+    слота. Слоти видалених елементів потрапляють у список вільних і використовуються
+    повторно. На 10 млн цілих чисел (typecode "q") припадає близько 120 МБ.
+    """
+
+    def __init__(self, typecode="q"):
+        """
+        Ініціалізує порожній компактний список.
+
+        Args:
+            typecode: Код типу значень для модуля array ("q" - int64, "d" - float64 тощо).
+        """
+        self._values = array(typecode)
+        self._next = array("i")
+        self.head = _NIL
+        self.tail = _NIL
+        self.size = 0
+        self._free = _NIL
+
+    def _clear(self):
+        """
+        Робить список порожнім після перенесення його елементів до іншого списку.
+        """
+        self._values = array(self.typecode)
+        self._next = array("i")
+        self.head = self.tail = _NIL
+        self.size = 0
+        self._free = _NIL
+
+    def __len__(self):
+        """
+        Повертає кількість елементів у списку.
+        """
+        return self.size
+
+    def __iter__(self):
+        """
+        Ліниво повертає значення від початку до кінця списку.
+        """
+        values, nxt = self._values, self._next
+        cur = self.head
+        while cur != _NIL:
+            yield values[cur]
+            cur = nxt[cur]
+
+    @classmethod
+    def from_iterable(cls, iterable, typecode="q"):
+        """
+        Будує компактний список з ітерованого об'єкта; слоти займаються поспіль.
+
+        Args:
+            iterable: Джерело значень.
+            typecode: Код типу значень для модуля array.
+
+        Returns:
+            Новий CompactLinkedList.
+        """
+        llist = cls(typecode)
+        llist.extend(iterable)
+        return llist
+
+    def extend(self, iterable):
+        """
+        Додає всі значення ітерованого об'єкта в кінець списку за один прохід.
+
+        Якщо вільних слотів немає, значення дописуються у масиви пакетно: масиви NumPy
+        копіюються напряму через буфер, а індекси наступних слотів генеруються
+        частинами по _LINK_CHUNK, тож тимчасові копії не перевищують кількох МБ.
+
+        Args:
+            iterable: Джерело значень.
+        """
+        if self._free != _NIL:
+            for data in iterable:
+                self.insert_at_end(data)
+            return
+
+        first = len(self._values)
+        if isinstance(iterable, np.ndarray):
+            self._values.frombytes(np.ascontiguousarray(iterable, dtype=self.typecode).view(np.uint8))
+        else:
+            self._values.extend(iterable)
+        count = len(self._values) - first
+        if not count:
+            return
+
+        end = first + count
+        for start in range(first + 1, end + 1, _LINK_CHUNK):
+            links = np.arange(start, min(start + _LINK_CHUNK, end + 1), dtype=np.int32)
+            self._next.frombytes(links.view(np.uint8))
+        self._next[-1] = _NIL
+        if self.head == _NIL:
+            self.head = first
+        else:
+            self._next[self.tail] = first
+        self.tail = first + count - 1
+        self.size += count
+
+    def to_list(self):
+        """
+        Повертає значення у порядку обходу у вигляді списку Python.
+        """
+        return self.to_array().tolist()
+
+    @property
+    def typecode(self):
+        """
+        Повертає код типу значень списку.
+        """
+        return self._values.typecode
+
+    def value(self, slot):
+        """
+        Повертає значення, що зберігається у заданому слоті.
+
+        Args:
+            slot: Номер слота (аналог вузла у LinkedList).
+        """
+        return self._values[slot]
+
+    def _alloc(self, data):
+        """
+        Виділяє слот для нового елемента, повторно використовуючи вільні слоти.
+
+        Args:
+            data: Значення нового елемента.
+
+        Returns:
+            Номер виділеного слота.
+        """
+        slot = self._free
+        if slot != _NIL:
+            self._free = self._next[slot]
+            self._values[slot] = data
+            self._next[slot] = _NIL
+        else:
+            slot = len(self._values)
+            self._values.append(data)
+            self._next.append(_NIL)
+        self.size += 1
+        return slot
+
+    def insert_at_beginning(self, data):
+        """
+        Додає елемент з заданими даними в початок списку.
+
+        Args:
+            data: Дані, які будуть вставлені.
+
+        Returns:
+            Номер слота нового елемента.
+        """
+        slot = self._alloc(data)
+        self._next[slot] = self.head
+        self.head = slot
+        if self.tail == _NIL:
+            self.tail = slot
+        return slot
+
+    def insert_at_end(self, data):
+        """
+        Додає елемент з заданими даними в кінець списку.
+
+        Args:
+            data: Дані, які будуть вставлені.
+
+        Returns:
+            Номер слота нового елемента.
+        """
+        slot = self._alloc(data)
+        if self.head == _NIL:
+            self.head = slot
+        else:
+            self._next[self.tail] = slot
+        self.tail = slot
+        return slot
+
+    def insert_after(self, prev_slot, data):
+        """
+        Вставляє елемент з заданими даними після певного слота.
+
+        Args:
+            prev_slot: Слот, після якого буде вставлено новий елемент.
+            data: Дані, які будуть вставлені.
+
+        Returns:
+            Номер слота нового елемента або None.
+        """
+        if prev_slot is None or prev_slot == _NIL:
+            print("Попереднього вузла не існує.")
+            return None
+        slot = self._alloc(data)
+        self._next[slot] = self._next[prev_slot]
+        self._next[prev_slot] = slot
+        if prev_slot == self.tail:
+            self.tail = slot
+        return slot
+
+    def insert_before(self, next_slot, data):
+        """
+        Вставляє елемент з заданими даними перед певним слотом.
+
+        Args:
+            next_slot: Слот, перед яким буде вставлено новий елемент.
+            data: Дані, які будуть вставлені.
+
+        Returns:
+            Номер слота нового елемента або None.
+        """
+        if next_slot is None or next_slot == _NIL:
+            print("Наступного вузла не існує.")
+            return None
+        if next_slot == self.head:
+            return self.insert_at_beginning(data)
+
+        nxt = self._next
+        current = self.head
+        while current != _NIL and nxt[current] != next_slot:
+            current = nxt[current]
+        if current == _NIL:
+            print("Вузол не належить списку.")
+            return None
+        return self.insert_after(current, data)
+
+    def delete_node(self, key):
+        """
+        Видаляє перший елемент з заданими даними, повертаючи його слот у список вільних.
+
+        Args:
+            key: Дані елемента, який слід видалити.
+        """
+        values, nxt = self._values, self._next
+        prev = _NIL
+        cur = self.head
+        while cur != _NIL and values[cur] != key:
+            prev = cur
+            cur = nxt[cur]
+        if cur == _NIL:
+            return
+
+        if prev == _NIL:
+            self.head = nxt[cur]
+        else:
+            nxt[prev] = nxt[cur]
+        if cur == self.tail:
+            self.tail = prev
+        nxt[cur] = self._free
+        self._free = cur
+        self.size -= 1
+
+    def search_element(self, data):
+        """
+        Шукає елемент з заданими даними у списку.
+
+        Args:
+            data: Дані для пошуку.
+
+        Returns:
+            Номер слота, що містить дані, якщо знайдено, в іншому випадку None.
+        """
+        values, nxt = self._values, self._next
+        cur = self.head
+        while cur != _NIL:
+            if values[cur] == data:
+                return cur
+            cur = nxt[cur]
+        return None
+
+    def print_list(self):
+        """
+        Виводить елементи списку у консоль.
+        """
+        for value in self:
+            print(value)
+
+    def _order(self):
+        """
+        Збирає номери слотів у порядку обходу списку.
+
+        Returns:
+            Масив NumPy int32 з номерами слотів.
+        """
+        order = array("i", [0]) * self.size
+        nxt = self._next
+        cur = self.head
+        for i in range(self.size):
+            order[i] = cur
+            cur = nxt[cur]
+        return np.frombuffer(order, dtype=np.int32)
+
+    def _relink(self, order):
+        """
+        Перев'язує слоти у заданому порядку за допомогою векторних операцій над масивом індексів.
+
+        Args:
+            order: Масив номерів слотів у новому порядку.
+        """
+        if len(order) == 0:
+            return
+        nxt = np.frombuffer(self._next, dtype=np.int32)
+        nxt[order[:-1]] = order[1:]
+        nxt[order[-1]] = _NIL
+        del nxt
+        self.head = int(order[0])
+        self.tail = int(order[-1])
+
+    def reverse_list(self):
+        """
+        Реверсує список, переписуючи лише масив індексів наступних елементів.
+        """
+        if self.size > 1:
+            self._relink(self._order()[::-1])
+
+    def sort(self, key=None, reverse=False):
+        """
+        Стабільно сортує список, перев'язуючи слоти без переміщення значень.
+
+        Без key сортування виконується NumPy над масивом значень.
+
+        Args:
+            key: Функція, що обчислює ключ сортування зі значення.
+            reverse: Якщо True, сортує за спаданням.
+        """
+        if self.size < 2:
+            return
+        order = self._order()
+        if key is not None:
+            values = self._values
+            order = np.array(
+                sorted(order.tolist(), key=lambda slot: key(values[slot]), reverse=reverse),
+                dtype=np.int32,
+            )
+        else:
+            values = np.frombuffer(self._values, dtype=self.typecode)[order]
+            if reverse:
+                # стабільне сортування за спаданням: сортуємо обернений масив і обертаємо результат
+                perm = len(values) - 1 - np.argsort(values[::-1], kind="stable")[::-1]
+            else:
+                perm = np.argsort(values, kind="stable")
+            order = order[perm]
+        self._relink(order)
+
+    def to_array(self):
+        """
+        Повертає значення списку у порядку обходу як масив NumPy.
+        """
+        return np.frombuffer(self._values, dtype=self.typecode)[self._order()]
+
+
+def merge_sorted_compact_lists(list1, list2):
+    """
+    Об'єднує два відсортованих компактних списки в один відсортований компактний список.
+
+    Як і merge_sorted_linked_lists, забирає елементи з вхідних списків (вони стають
+    порожніми); при рівних значеннях першим іде елемент з list1. Тип значень результату
+    визначається за правилами NumPy (np.result_type), тож, наприклад, "q" та "i" дають "q".
+
+    Args:
+        list1: Перший відсортований CompactLinkedList.
+        list2: Другий відсортований CompactLinkedList.
+
+    Returns:
+        Новий CompactLinkedList з усіма елементами у відсортованому порядку.
+    """
+    left, right = list1.to_array(), list2.to_array()
+    dtype = np.result_type(left, right)
+    typecode = next(code for code in _ARRAY_TYPECODES if np.dtype(code) == dtype)
+    # кожен елемент right стає після всіх елементів left, що не більші за нього
+    right_pos = np.searchsorted(left, right, side="right") + np.arange(len(right))
+    values = np.empty(len(left) + len(right), dtype=dtype)
+    is_right = np.zeros(len(values), dtype=bool)
+    is_right[right_pos] = True
+    values[right_pos] = right
+    values[~is_right] = left
+    merged = CompactLinkedList.from_iterable(values, typecode)
+    list1._clear()
+    list2._clear()
+    return merged
+
+
+def benchmark_indexed(sizes=(10_000, 100_000, 1_000_000), operations=100, seed=42):
+    """
+    Порівнює звичайний та індексований режими LinkedList на пошуку, вставці перед
+    вузлом і видаленні за ключем.
+
+    Args:
+        sizes: Розміри списків для вимірювань.
+        operations: Кількість операцій кожного типу на один розмір.
+        seed: Початкове значення генератора випадкових чисел.
+    """
+    rng = random.Random(seed)
+    print(f"{'N':>10} {'режим':>10} {'побудова, с':>12} {'пошук, мкс':>12} "
+          f"{'вставка, мкс':>13} {'видалення, мкс':>15}")
+    for size in sizes:
+        keys = rng.sample(range(size), operations)
+        for indexed in (False, True):
+            llist = LinkedList(indexed=indexed)
+            # як і timeit, вимикаємо збирач сміття на час вимірювань
+            gc.collect()
+            gc.disable()
+            start = time.perf_counter()
+            for value in range(size):
+                llist.insert_at_end(value)
+            build = time.perf_counter() - start
+
+            start = time.perf_counter()
+            nodes = [llist.search_element(key) for key in keys]
+            search = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for node in nodes:
+                llist.insert_before(node, -1)
+            insert = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for key in keys:
+                llist.delete_node(key)
+            delete = time.perf_counter() - start
+            gc.enable()
 
-    return dummy.next
+            per_op = 1e6 / operations
+            print(f"{size:>10} {'індекс' if indexed else 'звичайний':>10} {build:>12.3f} "
+                  f"{search * per_op:>12.1f} {insert * per_op:>13.1f} {delete * per_op:>15.1f}")
+            # звільняємо ланцюжок поза вимірюваними ділянками
+            del llist, nodes
 
 
-if __name__ == "__main__":
+if __name__ == "__main__" and "--benchmark" in sys.argv:
+    benchmark_indexed()
+    benchmark_sorted()
+elif __name__ == "__main__":
     llist = LinkedList()
 
     llist.insert_at_beginning(5)
@@ -287,8 +1620,6 @@ if __name__ == "__main__":
     llist1.insert_at_end(253)
     llist1.sort()
 
-    merged_head = merge_sorted_linked_lists(llist, llist1)
-    merged_list = LinkedList()
-    merged_list.head = merged_head
+    merged_list = merge_sorted_linked_lists(llist, llist1)
     print("Об'єднаний відсортований зв'язаний список:")
     merged_list.print_list()
@@ -1,7 +1,368 @@
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
 import matplotlib.pyplot as plt
 import numpy as np
+from matplotlib.figure import Figure
+
+def _branch_ends(x, y, angles, length):
+    """
+    Функція для обчислення кінцевих точок набору гілок.
+
+    Args:
+        x: Масив x-координат початків гілок.
+        y: Масив y-координат початків гілок.
+        angles: Масив кутів гілок у градусах.
+        length: Довжина гілок.
+
+    Returns:
+        tuple: Масиви x- та y-координат кінців гілок.
+    """
+    radians = np.radians(angles)
+    return x + length * np.cos(radians), y + length * np.sin(radians)
+
+def _split_branches(end_x, end_y, angles, branch_angle):
+    """
+    Функція для породження двох дочірніх гілок з кінця кожної гілки.
+
+    Args:
+        end_x: Масив x-координат кінців гілок.
+        end_y: Масив y-координат кінців гілок.
+        angles: Масив кутів гілок у градусах.
+        branch_angle: Кут відхилення дочірніх гілок.
+
+    Returns:
+        tuple: Масиви x, y та кутів дочірніх гілок (ліва дочірня гілка йде перед правою).
+    """
+    return (
+        np.repeat(end_x, 2),
+        np.repeat(end_y, 2),
+        np.column_stack((angles - branch_angle, angles + branch_angle)).ravel(),
+    )
+
+def _to_segments(x, y, end_x, end_y):
+    """
+    Функція для пакування початків і кінців гілок у масив відрізків форми (n, 2, 2).
+    """
+    return np.stack((np.column_stack((x, y)), np.column_stack((end_x, end_y))), axis=1)
+
+def _fill_levels(segments, angles_out, start, x, y, angles, length, branch_angle, ratio):
+    """
+    Функція для заповнення масиву відрізків рівень за рівнем, починаючи з заданих гілок.
+
+    Усі гілки рівня обчислюються однією векторною операцією NumPy з масивів
+    попереднього рівня; ліва дочірня гілка йде перед правою.
+
+    Args:
+        segments: Масив форми (n, 2, 2), що заповнюється з позиції start до кінця.
+        angles_out: Масив довжини n для кутів відповідних гілок.
+        start: Позиція першої гілки поточного рівня.
+        x: Масив x-координат початків гілок поточного рівня.
+        y: Масив y-координат початків гілок поточного рівня.
+        angles: Масив кутів гілок поточного рівня.
+        length: Довжина гілок поточного рівня.
+        branch_angle: Кут відхилення дочірніх гілок у градусах.
+        ratio: Відношення довжини дочірньої гілки до батьківської.
+
+    Returns:
+        None
+    """
+    while start < len(segments):
+        # обчислення кінцевих точок усіх гілок поточного рівня
+        end_x, end_y = _branch_ends(x, y, angles, length)
+
+        stop = start + len(x)
+        level = segments[start:stop]
+        level[:, 0, 0], level[:, 0, 1] = x, y
+        level[:, 1, 0], level[:, 1, 1] = end_x, end_y
+        angles_out[start:stop] = angles
+        start = stop
+
+        # кожна гілка породжує дві нові з її кінцевої точки
+        x, y, angles = _split_branches(end_x, end_y, angles, branch_angle)
+        length *= ratio
+
+def _compute_tree(origin, angle, length, depth, branch_angle, ratio):
+    """
+    Функція для обчислення відрізків дерева разом з кутами гілок.
+
+    Returns:
+        tuple: Масив відрізків форми (2**depth - 1, 2, 2) та масив кутів гілок.
+    """
+    segments = np.empty((2**depth - 1, 2, 2))
+    angles = np.empty(len(segments))
+    _fill_levels(
+        segments,
+        angles,
+        0,
+        np.array([origin[0]], dtype=float),
+        np.array([origin[1]], dtype=float),
+        np.array([angle], dtype=float),
+        length,
+        branch_angle,
+        ratio,
+    )
+    return segments, angles
+
+def _extend_tree(segments, angles, depth, length, branch_angle, ratio):
+    """
+    Функція для нарощування вже обчисленого дерева до більшої глибини.
+
+    Нові рівні будуються з кінців гілок останнього наявного рівня, тож результат
+    збігається з обчисленням з нуля.
+
+    Args:
+        segments: Відрізки дерева меншої глибини.
+        angles: Кути гілок дерева меншої глибини.
+        depth: Нова глибина дерева.
+        length: Довжина стовбура.
+        branch_angle: Кут відхилення дочірніх гілок у градусах.
+        ratio: Відношення довжини дочірньої гілки до батьківської.
+
+    Returns:
+        tuple: Масив відрізків та масив кутів дерева глибини depth.
+    """
+    old_depth = (len(segments) + 1).bit_length() - 1
+    last = slice(2 ** (old_depth - 1) - 1, len(segments))
+    # довжина останнього рівня обчислюється тими самими множеннями, що й з нуля
+    for _ in range(old_depth - 1):
+        length *= ratio
+
+    new_segments = np.empty((2**depth - 1, 2, 2))
+    new_angles = np.empty(len(new_segments))
+    new_segments[:len(segments)] = segments
+    new_angles[:len(angles)] = angles
+    x, y, child_angles = _split_branches(
+        segments[last, 1, 0], segments[last, 1, 1], angles[last], branch_angle
+    )
+    _fill_levels(
+        new_segments, new_angles, len(segments), x, y, child_angles,
+        length * ratio, branch_angle, ratio,
+    )
+    return new_segments, new_angles
+
+def _subtree_levels(x, y, angles, length, levels, branch_angle, ratio):
+    """
+    Функція-обробник пулу процесів: обчислює рівні піддерев для блоку гілок.
+
+    Returns:
+        list: Масиви відрізків для кожного з levels рівнів.
+    """
+    result = []
+    for _ in range(levels):
+        end_x, end_y = _branch_ends(x, y, angles, length)
+        result.append(_to_segments(x, y, end_x, end_y))
+        x, y, angles = _split_branches(end_x, end_y, angles, branch_angle)
+        length *= ratio
+    return result
 
-def draw_branch(ax, origin, angle, length, depth):
+def compute_segments(origin, angle, length, depth, branch_angle=45, ratio=0.8, processes=None):
+    """
+    Функція для обчислення відрізків дерева Піфагора рівень за рівнем.
+
+    Порядок гілок на кожному рівні збігається з порядком рекурсивного обходу.
+
+    Args:
+        origin: Початкова точка стовбура.
+        angle: Кут стовбура в градусах.
+        length: Довжина стовбура.
+        depth: Глибина рекурсії (кількість рівнів гілок).
+        branch_angle: Кут відхилення дочірніх гілок у градусах.
+        ratio: Відношення довжини дочірньої гілки до батьківської.
+        processes: Кількість процесів для розподілу верхніх піддерев. Якщо не задано
+            або 1, обчислення виконується в поточному процесі.
+
+    Returns:
+        segments: Масив форми (2**depth - 1, 2, 2) з початковими та кінцевими точками гілок.
+    """
+    if not processes or processes < 2 or depth < 2:
+        return _compute_tree(origin, angle, length, depth, branch_angle, ratio)[0]
+
+    # верхні рівні рахуються тут, а піддерева під ними - блоками у процесах
+    split_depth = min(depth - 1, (processes - 1).bit_length() + 2)
+    top, top_angles = _compute_tree(origin, angle, length, split_depth, branch_angle, ratio)
+    last = slice(2 ** (split_depth - 1) - 1, len(top))
+    x, y, angles = _split_branches(top[last, 1, 0], top[last, 1, 1], top_angles[last], branch_angle)
+    for _ in range(split_depth):
+        length *= ratio
+
+    bounds = np.linspace(0, len(x), min(processes, len(x)) + 1).astype(int)
+    blocks = list(zip(bounds[:-1], bounds[1:]))
+    levels = depth - split_depth
+    with ProcessPoolExecutor(max_workers=len(blocks)) as pool:
+        futures = [
+            pool.submit(
+                _subtree_levels, x[lo:hi], y[lo:hi], angles[lo:hi],
+                length, levels, branch_angle, ratio,
+            )
+            for lo, hi in blocks
+        ]
+        results = [future.result() for future in futures]
+
+    segments = np.empty((2**depth - 1, 2, 2))
+    segments[:len(top)] = top
+    start = len(top)
+    # блоки суміжні, тож на кожному рівні їхні частини просто йдуть одна за одною
+    for level in range(levels):
+        for block in results:
+            part = block[level]
+            segments[start:start + len(part)] = part
+            start += len(part)
+    return segments
+
+class SegmentCache:
+    """
+    LRU-кеш відрізків дерева Піфагора зі стовбуром у (0, 0) під кутом 90°.
+
+    Ключ запису - (depth, branch_angle, ratio, length). Якщо для тих самих параметрів
+    уже є дерево іншої глибини, менше дерево береться як префікс більшого
+    (рівні йдуть поспіль), а більше добудовується з останнього рівня меншого.
+    """
+
+    def __init__(self, max_entries=16):
+        """
+        Ініціалізує порожній кеш.
+
+        Args:
+            max_entries: Максимальна кількість збережених дерев.
+        """
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        """
+        Повертає кількість збережених дерев.
+        """
+        return len(self._entries)
+
+    def get(self, depth, branch_angle=45, ratio=0.8, length=40):
+        """
+        Повертає відрізки дерева, обчислюючи лише відсутні рівні.
+
+        Повернений масив доступний лише для читання, бо спільний з кешем.
+
+        Args:
+            depth: Глибина рекурсії (кількість рівнів гілок).
+            branch_angle: Кут відхилення дочірніх гілок у градусах.
+            ratio: Відношення довжини дочірньої гілки до батьківської.
+            length: Довжина стовбура.
+
+        Returns:
+            Масив форми (2**depth - 1, 2, 2).
+        """
+        key = (depth, branch_angle, ratio, length)
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return self._entries[key][0]
+
+        related = [
+            cached_depth
+            for cached_depth, *params in self._entries
+            if params == [branch_angle, ratio, length] and cached_depth > 0
+        ]
+        deeper = [cached_depth for cached_depth in related if cached_depth > depth]
+        shallower = [cached_depth for cached_depth in related if cached_depth < depth]
+        if deeper:
+            segments, angles = self._entries[(min(deeper), branch_angle, ratio, length)]
+            size = 2**depth - 1
+            # копія, щоб після витіснення глибшого запису його буфер не утримувався зрізом
+            segments, angles = segments[:size].copy(), angles[:size].copy()
+        elif shallower:
+            base = self._entries[(max(shallower), branch_angle, ratio, length)]
+            segments, angles = _extend_tree(*base, depth, length, branch_angle, ratio)
+        else:
+            segments, angles = _compute_tree((0.0, 0.0), 90, length, depth, branch_angle, ratio)
+
+        segments.flags.writeable = False
+        angles.flags.writeable = False
+        self._entries[key] = (segments, angles)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return segments
+
+def iter_segments(origin, angle, length, depth, branch_angle=45, ratio=0.8, chunk_size=65536):
+    """
+    Генератор відрізків дерева Піфагора блоками обмеженого розміру.
+
+    Гілки обробляються пакетами не більше chunk_size, а піддерева обходяться в глибину,
+    тому пам'ять становить O(depth * chunk_size) незалежно від загальної кількості
+    відрізків. Набір відрізків збігається з compute_segments, але порядок інший.
+
+    Args:
+        origin: Початкова точка стовбура.
+        angle: Кут стовбура в градусах.
+        length: Довжина стовбура.
+        depth: Глибина рекурсії (кількість рівнів гілок).
+        branch_angle: Кут відхилення дочірніх гілок у градусах.
+        ratio: Відношення довжини дочірньої гілки до батьківської.
+        chunk_size: Максимальна кількість гілок в одному пакеті.
+
+    Yields:
+        Масиви форми (n, 2, 2), n <= chunk_size, з початковими та кінцевими точками гілок.
+    """
+    stack = [(
+        np.array([origin[0]], dtype=float),
+        np.array([origin[1]], dtype=float),
+        np.array([angle], dtype=float),
+        length,
+        depth,
+    )]
+    while stack:
+        x, y, angles, length, remaining = stack.pop()
+        if remaining <= 0:
+            continue
+        end_x, end_y = _branch_ends(x, y, angles, length)
+        yield _to_segments(x, y, end_x, end_y)
+
+        if remaining > 1:
+            child_x, child_y, child_angles = _split_branches(end_x, end_y, angles, branch_angle)
+            # у стек кладемо частини у зворотному порядку, щоб першою обробилась ліва
+            for start in reversed(range(0, len(child_x), chunk_size)):
+                stop = start + chunk_size
+                stack.append((
+                    child_x[start:stop],
+                    child_y[start:stop],
+                    child_angles[start:stop],
+                    length * ratio,
+                    remaining - 1,
+                ))
+
+def export_segments(path, depth, branch_angle=45, ratio=0.8, length=40, chunk_size=65536):
+    """
+    Функція для потокового запису відрізків дерева Піфагора у файл.
+
+    Файл з розширенням .csv отримує рядки "x0,y0,x1,y1"; будь-який інший - сирі
+    значення float64 у тому самому порядку (по 32 байти на відрізок).
+
+    Args:
+        path: Шлях до вихідного файлу.
+        depth: Глибина рекурсії (кількість рівнів гілок).
+        branch_angle: Кут відхилення дочірніх гілок у градусах.
+        ratio: Відношення довжини дочірньої гілки до батьківської.
+        length: Довжина стовбура.
+        chunk_size: Максимальна кількість відрізків, що одночасно зберігаються в пам'яті.
+
+    Returns:
+        int: Кількість записаних відрізків.
+    """
+    as_csv = Path(path).suffix.lower() == ".csv"
+    count = 0
+    with open(path, "w" if as_csv else "wb") as file:
+        if as_csv:
+            file.write("x0,y0,x1,y1\n")
+        for segments in iter_segments(
+            (0.0, 0.0), 90, length, depth, branch_angle, ratio, chunk_size
+        ):
+            rows = segments.reshape(-1, 4)
+            if as_csv:
+                np.savetxt(file, rows, delimiter=",", fmt="%.10g")
+            else:
+                rows.tofile(file)
+            count += len(rows)
+    return count
+
+def draw_branch(ax, origin, angle, length, depth, branch_angle=45, ratio=0.8):
     """
     Функція для малювання гілок дерева Піфагора.
 
@@ -11,38 +372,56 @@ def draw_branch(ax, origin, angle, length, depth):
         angle: Кут, під яким відхиляється гілка.
         length: Довжина гілки.
         depth: Глибина рекурсії.
+        branch_angle: Кут відхилення дочірніх гілок у градусах.
+        ratio: Відношення довжини дочірньої гілки до батьківської.
 
     Returns:
         None
     """
-    if depth == 0:
-        return None
-
-    # обчислення кінцевої точки гілки
-    end = (
-        origin[0] + length * np.cos(np.radians(angle)),
-        origin[1] + length * np.sin(np.radians(angle)),
-    )
+    draw_segments(ax, compute_segments(origin, angle, length, depth, branch_angle, ratio))
 
-    ax.plot([origin[0], end[0]], [origin[1], end[1]], "k-", lw=2)
+def draw_segments(ax, segments):
+    """
+    Функція для малювання готового масиву відрізків.
 
-    new_length = length * 0.8
+    Args:
+        ax: Вісь для малювання.
+        segments: Масив форми (n, 2, 2) з початковими та кінцевими точками гілок.
 
-    # рекурсивні виклики для двох нових гілок
-    draw_branch(ax, end, angle - 45, new_length, depth - 1)
-    draw_branch(ax, end, angle + 45, new_length, depth - 1)
+    Returns:
+        None
+    """
+    # усі гілки малюються однією лінією, розірваною значеннями NaN між відрізками,
+    # замість окремого об'єкта Line2D на кожну гілку
+    points = np.full((len(segments), 3, 2), np.nan)
+    points[:, :2] = segments
+    points = points.reshape(-1, 2)
+    ax.plot(points[:, 0], points[:, 1], "k-", lw=2)
 
-def pythagoras_tree(depth=5):
+def pythagoras_tree(
+    depth=5, branch_angle=45, ratio=0.8, length=40, output=None, cache=None, processes=None
+):
     """
-    Функція для створення дерева Піфагора за допомогою рекурсії.
+    Функція для створення дерева Піфагора.
 
     Args:
         depth: Глибина рекурсії (кількість рівнів гілок).
+        branch_angle: Кут відхилення дочірніх гілок у градусах.
+        ratio: Відношення довжини дочірньої гілки до батьківської.
+        length: Початкова довжина гілки.
+        output: Шлях до файлу зображення (.png, .svg тощо). Якщо задано, дерево
+            малюється без відкриття вікна (через Agg) і зберігається у файл.
+        cache: Екземпляр SegmentCache для повторного використання обчисленої геометрії.
+        processes: Кількість процесів для обчислення піддерев (якщо cache не задано).
 
     Returns:
         None
     """
-    _, ax = plt.subplots()
+    if output is None:
+        _, ax = plt.subplots()
+    else:
+        # фігура без pyplot не потребує графічного інтерфейсу
+        ax = Figure().subplots()
 
     # встановлення відповідності сторін для коректного відображення кутів
     ax.set_aspect("equal")
@@ -52,14 +431,27 @@ def pythagoras_tree(depth=5):
     # початковий кут
     angle = 90
 
-    # початкова довжина гілки
-    length = 40
-    draw_branch(ax, origin, angle, length, depth)
+    if cache is not None:
+        segments = cache.get(depth, branch_angle, ratio, length)
+    else:
+        segments = compute_segments(
+            origin, angle, length, depth, branch_angle, ratio, processes
+        )
+    draw_segments(ax, segments)
 
-    ax.set_xlim(-100, 100)
-    ax.set_ylim(0, 150)
+    # межі охоплюють усі відрізки з полем 5%, тож дерево не обрізається за будь-яких
+    # branch_angle та ratio
+    if len(segments):
+        points = np.asarray(segments).reshape(-1, 2)
+        low, high = points.min(axis=0), points.max(axis=0)
+        margin = 0.05 * (high - low).max()
+        ax.set_xlim(low[0] - margin, high[0] + margin)
+        ax.set_ylim(low[1] - margin, high[1] + margin)
 
-    plt.show()
+    if output is None:
+        plt.show()
+    else:
+        ax.figure.savefig(output)
 
 if __name__ == "__main__":
     depth = int(input("Введіть глибину рекурсії: "))
@@ -1,7 +1,25 @@
+import contextlib
 import heapq
+import itertools
+import multiprocessing
+import os
+import random
+import sys
+import time
+import tracemalloc
+from array import array
+from multiprocessing import shared_memory
 import networkx as nx
 import matplotlib.pyplot as plt
 import numpy as np
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+
+# сигнатура та розмір заголовка бінарного формату CSRGraph.save
+_GRAPH_MAGIC = b"CSRGRAPH"
+_GRAPH_HEADER = 40
+# тип блоку імен вершин: цілі числа int64 або рядки UTF-8 з довжинами
+_NAMES_INT, _NAMES_STR = 0, 1
 
 def dijkstra(graph: dict, start):
     """
@@ -45,6 +63,1273 @@ def dijkstra(graph: dict, start):
     return distances
 
 
+def reverse_graph(graph: dict):
+    """
+    Функція для побудови графа з оберненими напрямками ребер.
+
+    Args:
+        graph: Граф у форматі словника з вагами ребер.
+
+    Returns:
+        dict: Граф у тому самому форматі, де кожне ребро u -> v замінене на v -> u.
+    """
+    reversed_graph = {vertex: {} for vertex in graph}
+    for vertex, neighbors in graph.items():
+        for neighbor, weight in neighbors.items():
+            reversed_graph.setdefault(neighbor, {})[vertex] = weight
+    return reversed_graph
+
+
+def _build_path(predecessors, vertex):
+    """
+    Функція для відновлення шляху за словником попередників.
+
+    Args:
+        predecessors: Словник "вершина -> попередня вершина" (None для початкової).
+        vertex: Кінцева вершина шляху.
+
+    Returns:
+        list: Вершини шляху від початкової до vertex.
+    """
+    path = []
+    while vertex is not None:
+        path.append(vertex)
+        vertex = predecessors[vertex]
+    path.reverse()
+    return path
+
+
+def shortest_path(graph: dict, source, target, bidirectional=False, reverse=None, stats=None):
+    """
+    Пошук найкоротшого шляху між двома вершинами з раннім завершенням.
+
+    Алгоритм Дейкстри зупиняється, щойно цільова вершина отримує остаточну відстань.
+    У двонаправленому режимі пошук ведеться одночасно від source (по графу) та від
+    target (по оберненому графу) і завершується, коли сума мінімумів обох черг
+    не менша за найкращий знайдений шлях.
+
+    Args:
+        graph: Граф у форматі словника з вагами ребер.
+        source: Початкова вершина.
+        target: Кінцева вершина.
+        bidirectional: Чи використовувати двонаправлений пошук.
+        reverse: Попередньо обчислений reverse_graph(graph) для двонаправленого режиму.
+        stats: Необов'язковий словник, у який записується кількість остаточно
+            опрацьованих вершин ("settled").
+
+    Returns:
+        tuple: Список вершин найкоротшого шляху та його вартість
+            (порожній список та infinity, якщо target недосяжна).
+    """
+    if bidirectional:
+        if reverse is None:
+            reverse = reverse_graph(graph)
+        return _bidirectional_path(graph, reverse, source, target, stats)
+
+    return astar(graph, source, target, stats=stats)
+
+
+def astar(graph: dict, source, target, heuristic=None, stats=None):
+    """
+    Алгоритм A* для пошуку найкоротшого шляху між двома вершинами.
+
+    Вершини з черги вибираються за сумою відомої відстані та оцінки heuristic(v)
+    відстані від v до target. Оцінка має бути допустимою та узгодженою (як у
+    LandmarkIndex); без неї A* збігається з алгоритмом Дейкстри з раннім завершенням.
+
+    Args:
+        graph: Граф у форматі словника з вагами ребер.
+        source: Початкова вершина.
+        target: Кінцева вершина.
+        heuristic: Функція, що повертає нижню оцінку відстані від вершини до target.
+        stats: Необов'язковий словник, у який записується кількість остаточно
+            опрацьованих вершин ("settled").
+
+    Returns:
+        tuple: Список вершин найкоротшого шляху та його вартість
+            (порожній список та infinity, якщо target недосяжна).
+    """
+    if heuristic is None:
+        heuristic = lambda vertex: 0
+
+    distances = {source: 0}
+    predecessors = {source: None}
+    priority_queue = [(heuristic(source), 0, source)]
+    settled = 0
+
+    while priority_queue:
+        _, current_distance, current_vertex = heapq.heappop(priority_queue)
+
+        if current_distance > distances[current_vertex]:
+            continue
+        settled += 1
+
+        # відстань до вершини, знятої з черги, вже остаточна
+        if current_vertex == target:
+            if stats is not None:
+                stats["settled"] = settled
+            return _build_path(predecessors, target), current_distance
+
+        for neighbor, weight in graph.get(current_vertex, {}).items():
+            distance = current_distance + weight
+
+            if distance < distances.get(neighbor, float("infinity")):
+                distances[neighbor] = distance
+                predecessors[neighbor] = current_vertex
+                heapq.heappush(
+                    priority_queue, (distance + heuristic(neighbor), distance, neighbor)
+                )
+
+    if stats is not None:
+        stats["settled"] = settled
+    return [], float("infinity")
+
+
+def _bidirectional_path(graph, reverse, source, target, stats=None):
+    """
+    Двонаправлений алгоритм Дейкстри для shortest_path.
+
+    Returns:
+        tuple: Список вершин найкоротшого шляху та його вартість.
+    """
+    if source == target:
+        if stats is not None:
+            stats["settled"] = 0
+        return [source], 0
+
+    # індекс 0 - пошук від source, індекс 1 - пошук від target по оберненому графу
+    graphs = (graph, reverse)
+    distances = ({source: 0}, {target: 0})
+    predecessors = ({source: None}, {target: None})
+    queues = ([(0, source)], [(0, target)])
+    best_cost = float("infinity")
+    meeting_vertex = None
+    settled = 0
+
+    while True:
+        # відкидаємо застарілі записи на вершинах черг
+        for queue, dist in zip(queues, distances):
+            while queue and queue[0][0] > dist[queue[0][1]]:
+                heapq.heappop(queue)
+        tops = [queue[0][0] if queue else float("infinity") for queue in queues]
+        if tops[0] + tops[1] >= best_cost:
+            break
+
+        # розширюємо меншу з двох черг (обидві непорожні, інакше сума мінімумів нескінченна)
+        side = 0 if len(queues[0]) <= len(queues[1]) else 1
+        current_distance, current_vertex = heapq.heappop(queues[side])
+        dist, other_dist = distances[side], distances[1 - side]
+        settled += 1
+
+        for neighbor, weight in graphs[side].get(current_vertex, {}).items():
+            distance = current_distance + weight
+
+            if distance < dist.get(neighbor, float("infinity")):
+                dist[neighbor] = distance
+                predecessors[side][neighbor] = current_vertex
+                heapq.heappush(queues[side], (distance, neighbor))
+
+            if neighbor in other_dist and dist[neighbor] + other_dist[neighbor] < best_cost:
+                best_cost = dist[neighbor] + other_dist[neighbor]
+                meeting_vertex = neighbor
+
+    if stats is not None:
+        stats["settled"] = settled
+    if meeting_vertex is None:
+        return [], float("infinity")
+
+    path = _build_path(predecessors[0], meeting_vertex)
+    vertex = predecessors[1][meeting_vertex]
+    while vertex is not None:
+        path.append(vertex)
+        vertex = predecessors[1][vertex]
+    return path, best_cost
+
+
+def _encode_names(names, owner):
+    """
+    Кодує імена вершин для бінарних форматів збереження.
+
+    Цілі імена зберігаються масивом int64, рядкові - масивом довжин у байтах, за яким
+    іде їхній UTF-8 текст, тож тип імен зберігається, а самі імена можуть містити
+    будь-які символи.
+
+    Args:
+        names: Список імен вершин.
+        owner: Назва методу для повідомлення про помилку.
+
+    Returns:
+        tuple: Тип блоку (_NAMES_INT або _NAMES_STR) та байти блоку.
+
+    Raises:
+        TypeError: Якщо імена вершин не є всі рядками або всі цілими числами.
+    """
+    if all(type(name) is int for name in names):
+        return _NAMES_INT, np.array(names, dtype="<i8").tobytes()
+    if all(isinstance(name, str) for name in names):
+        encoded = [name.encode("utf-8") for name in names]
+        return _NAMES_STR, np.array([len(name) for name in encoded], dtype="<i8").tobytes() + b"".join(encoded)
+    raise TypeError(f"{owner} зберігає лише імена вершин, що всі є рядками або всі цілими числами")
+
+
+def _decode_names(kind, block, count):
+    """
+    Відновлює імена вершин з блоку, створеного _encode_names.
+
+    Args:
+        kind: Тип блоку (_NAMES_INT або _NAMES_STR).
+        block: Байти блоку.
+        count: Кількість імен.
+
+    Returns:
+        list: Імена вершин.
+    """
+    values = np.frombuffer(block, dtype="<i8", count=count).tolist()
+    if kind == _NAMES_INT:
+        return values
+    text = block[8 * count:]
+    ends = itertools.accumulate(values)
+    starts = itertools.chain([0], itertools.accumulate(values))
+    return [text[start:end].decode("utf-8") for start, end in zip(starts, ends)]
+
+
+def _npz_path(path):
+    """
+    Дописує до шляху розширення .npz так само, як це робить np.savez.
+
+    Args:
+        path: Шлях до файлу або відкритий файловий об'єкт (повертається без змін).
+    """
+    if isinstance(path, (str, os.PathLike)):
+        path = os.fspath(path)
+        if not path.endswith(".npz"):
+            path += ".npz"
+    return path
+
+
+class LandmarkIndex:
+    """
+    Попередньо обчислені відстані до та від орієнтирів для A* (алгоритм ALT).
+
+    За нерівністю трикутника для будь-якого орієнтира L:
+    d(v, t) >= d(L, t) - d(L, v) та d(v, t) >= d(v, L) - d(t, L), тож максимум цих
+    різниць по всіх орієнтирах є допустимою й узгодженою оцінкою для A*.
+    """
+
+    def __init__(self, vertices, landmarks, from_landmarks, to_landmarks):
+        """
+        Ініціалізує індекс з готових таблиць відстаней.
+
+        Args:
+            vertices: Вершини у порядку стовпців таблиць.
+            landmarks: Вершини-орієнтири у порядку рядків таблиць.
+            from_landmarks: Масив (кількість орієнтирів x кількість вершин) відстаней d(L, v).
+            to_landmarks: Масив тієї самої форми з відстанями d(v, L).
+        """
+        self.vertices = list(vertices)
+        self.landmarks = list(landmarks)
+        self.from_landmarks = np.asarray(from_landmarks, dtype=np.float64)
+        self.to_landmarks = np.asarray(to_landmarks, dtype=np.float64)
+        # рядки по вершинах у вигляді кортежів швидше читаються в циклі A*
+        self._rows = {
+            vertex: (tuple(from_row), tuple(to_row))
+            for vertex, from_row, to_row in zip(
+                self.vertices, self.from_landmarks.T.tolist(), self.to_landmarks.T.tolist()
+            )
+        }
+
+    @classmethod
+    def build(cls, graph: dict, landmarks=None, count=8, seed=None):
+        """
+        Обчислює таблиці відстаней для заданих або автоматично вибраних орієнтирів.
+
+        Якщо орієнтири не задано, перший вибирається випадково, а кожен наступний -
+        як вершина, найвіддаленіша від уже вибраних (з досяжних).
+
+        Args:
+            graph: Граф у форматі словника з вагами ребер.
+            landmarks: Список вершин-орієнтирів.
+            count: Кількість орієнтирів для автоматичного вибору.
+            seed: Початкове значення генератора для вибору першого орієнтира.
+
+        Returns:
+            LandmarkIndex: Побудований індекс.
+        """
+        reverse = reverse_graph(graph)
+        # повторне обертання дає граф, де кожна вершина є ключем словника
+        forward = reverse_graph(reverse)
+        vertices = list(reverse)
+        from_rows, to_rows = [], []
+
+        def add_landmark(landmark):
+            distances = dijkstra(forward, landmark)
+            from_rows.append([distances.get(vertex, float("infinity")) for vertex in vertices])
+            distances = dijkstra(reverse, landmark)
+            to_rows.append([distances.get(vertex, float("infinity")) for vertex in vertices])
+
+        if landmarks is None:
+            landmarks = [random.Random(seed).choice(vertices)]
+            add_landmark(landmarks[0])
+            closest = np.array(from_rows[0])
+            while len(landmarks) < min(count, len(vertices)):
+                reachable = np.where(np.isfinite(closest), closest, -1.0)
+                candidate = vertices[int(np.argmax(reachable))]
+                if candidate in landmarks:
+                    break
+                landmarks.append(candidate)
+                add_landmark(candidate)
+                closest = np.minimum(closest, from_rows[-1])
+        else:
+            for landmark in landmarks:
+                add_landmark(landmark)
+
+        return cls(vertices, landmarks, from_rows, to_rows)
+
+    def save(self, path):
+        """
+        Зберігає індекс у файл формату NumPy .npz (розширення дописується, якщо його немає).
+
+        Імена вершин кодуються так само, як у CSRGraph.save, а орієнтири зберігаються
+        як номери вершин, тож файл не містить pickle.
+
+        Args:
+            path: Шлях до файлу.
+
+        Raises:
+            TypeError: Якщо імена вершин не є всі рядками або всі цілими числами.
+        """
+        names_kind, names_block = _encode_names(self.vertices, "LandmarkIndex.save")
+        position = {vertex: i for i, vertex in enumerate(self.vertices)}
+        np.savez(
+            _npz_path(path),
+            names_kind=np.int64(names_kind),
+            num_vertices=np.int64(len(self.vertices)),
+            names=np.frombuffer(names_block, dtype=np.uint8),
+            landmarks=np.array([position[landmark] for landmark in self.landmarks], dtype=np.int64),
+            from_landmarks=self.from_landmarks,
+            to_landmarks=self.to_landmarks,
+        )
+
+    @classmethod
+    def load(cls, path):
+        """
+        Завантажує індекс, збережений методом save.
+
+        Args:
+            path: Шлях до файлу (з розширенням .npz або без нього, як і в save).
+
+        Returns:
+            LandmarkIndex: Завантажений індекс.
+        """
+        with np.load(_npz_path(path)) as data:
+            vertices = _decode_names(int(data["names_kind"]), data["names"].tobytes(), int(data["num_vertices"]))
+            return cls(
+                vertices,
+                [vertices[i] for i in data["landmarks"].tolist()],
+                data["from_landmarks"],
+                data["to_landmarks"],
+            )
+
+    def heuristic(self, target):
+        """
+        Повертає оцінку відстані до target для astar.
+
+        Args:
+            target: Кінцева вершина пошуку.
+
+        Returns:
+            Функція, що повертає нижню оцінку відстані від вершини до target.
+        """
+        empty = ((), ())
+        from_target, to_target = self._rows.get(target, empty)
+        rows = self._rows
+
+        def estimate(vertex):
+            from_vertex, to_vertex = rows.get(vertex, empty)
+            best = 0
+            # різниці нескінченностей дають NaN, і такі порівняння просто не спрацьовують
+            for lt, lv, vl, tl in zip(from_target, from_vertex, to_vertex, to_target):
+                if lt - lv > best:
+                    best = lt - lv
+                if vl - tl > best:
+                    best = vl - tl
+            return best
+
+        return estimate
+
+
+def benchmark_queries(size=100, queries=200, landmarks=8, seed=42):
+    """
+    Порівнює алгоритм Дейкстри з раннім завершенням та A* з орієнтирами (ALT)
+    на решітці size x size з випадковими вагами.
+
+    Args:
+        size: Сторона решітки.
+        queries: Кількість випадкових запитів.
+        landmarks: Кількість орієнтирів.
+        seed: Початкове значення генератора випадкових чисел.
+    """
+    rng = random.Random(seed)
+    graph = {(row, col): {} for row in range(size) for col in range(size)}
+    for row, col in graph:
+        for neighbor in ((row + 1, col), (row, col + 1)):
+            if neighbor in graph:
+                weight = rng.randint(1, 10)
+                graph[(row, col)][neighbor] = weight
+                graph[neighbor][(row, col)] = weight
+
+    start = time.perf_counter()
+    index = LandmarkIndex.build(graph, count=landmarks, seed=seed)
+    print(f"Побудова {landmarks} орієнтирів: {time.perf_counter() - start:.2f} с")
+
+    vertices = list(graph)
+    pairs = [(rng.choice(vertices), rng.choice(vertices)) for _ in range(queries)]
+    print(f"{'алгоритм':>10} {'вершин/запит':>14} {'мс/запит':>10}")
+    for name in ("Дейкстра", "ALT"):
+        settled = 0
+        start = time.perf_counter()
+        for source, target in pairs:
+            stats = {}
+            heuristic = index.heuristic(target) if name == "ALT" else None
+            astar(graph, source, target, heuristic, stats)
+            settled += stats["settled"]
+        elapsed = time.perf_counter() - start
+        print(f"{name:>10} {settled / queries:>14.0f} {elapsed * 1e3 / queries:>10.2f}")
+
+
+class DynamicShortestPaths:
+    """
+    Дерево найкоротших шляхів від однієї вершини, що підтримується при змінах ребер.
+
+    Після зміни ваги, додавання чи видалення ребра перераховується лише зачеплена
+    частина дерева, а не весь граф; відстані завжди збігаються з повним перерахунком.
+    """
+
+    def __init__(self, graph: dict, source):
+        """
+        Ініціалізує структуру та обчислює початкове дерево найкоротших шляхів.
+
+        Args:
+            graph: Граф у форматі словника з вагами ребер (копіюється).
+            source: Початкова вершина.
+        """
+        self.reverse = reverse_graph(graph)
+        self.graph = reverse_graph(self.reverse)
+        self.source = source
+        self.distances = {vertex: float("infinity") for vertex in self.graph}
+        self.predecessors = {vertex: None for vertex in self.graph}
+        self.distances[source] = 0
+        self._propagate([(0, source)])
+
+    def _propagate(self, priority_queue):
+        """
+        Запускає алгоритм Дейкстри з наявними відстанями, поширюючи лише покращення.
+
+        Args:
+            priority_queue: Початкові записи (відстань, вершина) для купи.
+        """
+        heapq.heapify(priority_queue)
+        distances, predecessors = self.distances, self.predecessors
+        while priority_queue:
+            current_distance, current_vertex = heapq.heappop(priority_queue)
+
+            if current_distance > distances[current_vertex]:
+                continue
+
+            for neighbor, weight in self.graph[current_vertex].items():
+                distance = current_distance + weight
+
+                if distance < distances[neighbor]:
+                    distances[neighbor] = distance
+                    predecessors[neighbor] = current_vertex
+                    heapq.heappush(priority_queue, (distance, neighbor))
+
+    def _add_vertex(self, vertex):
+        """
+        Додає ізольовану вершину, якщо її ще немає.
+        """
+        if vertex not in self.graph:
+            self.graph[vertex] = {}
+            self.reverse[vertex] = {}
+            self.distances[vertex] = float("infinity")
+            self.predecessors[vertex] = None
+
+    def _decrease(self, u, v, weight):
+        """
+        Обробляє появу коротшого ребра u -> v: покращення поширюються від v.
+        """
+        distance = self.distances[u] + weight
+        if distance < self.distances[v]:
+            self.distances[v] = distance
+            self.predecessors[v] = u
+            self._propagate([(distance, v)])
+
+    def _increase(self, u, v):
+        """
+        Обробляє подовження чи видалення ребра u -> v дерева найкоротших шляхів.
+
+        Відстані всього піддерева v скидаються, кожна вершина піддерева отримує
+        найкращу оцінку через вхідні ребра з незачепленої частини, після чого
+        алгоритм Дейкстри відновлює піддерево.
+        """
+        if self.predecessors[v] != u:
+            return
+
+        affected = [v]
+        affected_set = {v}
+        for vertex in affected:
+            for child in self.graph[vertex]:
+                if self.predecessors[child] == vertex and child not in affected_set:
+                    affected_set.add(child)
+                    affected.append(child)
+
+        for vertex in affected:
+            self.distances[vertex] = float("infinity")
+            self.predecessors[vertex] = None
+
+        priority_queue = []
+        for vertex in affected:
+            for parent, weight in self.reverse[vertex].items():
+                distance = self.distances[parent] + weight
+                if parent not in affected_set and distance < self.distances[vertex]:
+                    self.distances[vertex] = distance
+                    self.predecessors[vertex] = parent
+            if self.distances[vertex] < float("infinity"):
+                priority_queue.append((self.distances[vertex], vertex))
+        self._propagate(priority_queue)
+
+    def set_edge(self, u, v, weight):
+        """
+        Додає ребро u -> v або змінює його вагу.
+
+        Args:
+            u: Початкова вершина ребра.
+            v: Кінцева вершина ребра.
+            weight: Нова вага ребра.
+        """
+        self._add_vertex(u)
+        self._add_vertex(v)
+        old_weight = self.graph[u].get(v)
+        self.graph[u][v] = weight
+        self.reverse[v][u] = weight
+        if old_weight is not None and weight > old_weight:
+            self._increase(u, v)
+        else:
+            self._decrease(u, v, weight)
+
+    def remove_edge(self, u, v):
+        """
+        Видаляє ребро u -> v, якщо воно існує.
+
+        Args:
+            u: Початкова вершина ребра.
+            v: Кінцева вершина ребра.
+        """
+        if v not in self.graph.get(u, {}):
+            return
+        del self.graph[u][v]
+        del self.reverse[v][u]
+        self._increase(u, v)
+
+    def path(self, target):
+        """
+        Повертає найкоротший шлях від source до target за поточним деревом.
+
+        Args:
+            target: Кінцева вершина.
+
+        Returns:
+            list: Вершини шляху або порожній список, якщо target недосяжна.
+        """
+        if self.distances.get(target, float("infinity")) == float("infinity"):
+            return []
+        return _build_path(self.predecessors, target)
+
+
+def benchmark_updates(vertices=20_000, edges=100_000, updates=200, seed=42):
+    """
+    Порівнює затримку інкрементального оновлення DynamicShortestPaths з повним
+    перерахунком dijkstra після кожної зміни ваги ребра.
+
+    Args:
+        vertices: Кількість вершин випадкового графа.
+        edges: Кількість ребер.
+        updates: Кількість змін ваг.
+        seed: Початкове значення генератора випадкових чисел.
+    """
+    rng = random.Random(seed)
+    graph = {vertex: {} for vertex in range(vertices)}
+    for _ in range(edges):
+        u, v = rng.randrange(vertices), rng.randrange(vertices)
+        if u != v:
+            graph[u][v] = rng.randint(1, 100)
+    edge_list = [(u, v) for u in graph for v in graph[u]]
+
+    dynamic = DynamicShortestPaths(graph, 0)
+    incremental = full = 0.0
+    for _ in range(updates):
+        u, v = rng.choice(edge_list)
+        weight = rng.randint(1, 100)
+        graph[u][v] = weight
+
+        start = time.perf_counter()
+        dynamic.set_edge(u, v, weight)
+        incremental += time.perf_counter() - start
+
+        start = time.perf_counter()
+        expected = dijkstra(graph, 0)
+        full += time.perf_counter() - start
+
+    assert dynamic.distances == expected
+    print(f"Інкрементальне оновлення: {incremental * 1e3 / updates:.3f} мс")
+    print(f"Повний перерахунок:       {full * 1e3 / updates:.3f} мс")
+
+
+class CSRGraph:
+    """
+    Компактне представлення орієнтованого зваженого графа у форматі CSR.
+
+    Вершини нумеруються цілими числами 0..n-1. Ребра вершини v займають позиції
+    offsets[v]..offsets[v + 1] - 1 у масивах targets (номери кінців) та weights (ваги).
+    Імена вершин зберігаються у names, а відображення "ім'я -> номер" - в ids.
+    Обидва обчислюються ліниво, тож граф, відкритий через load, не читає імен,
+    доки вони не знадобляться.
+    """
+
+    def __init__(self, offsets, targets, weights, names=None):
+        """
+        Ініціалізує граф з готових масивів CSR.
+
+        Args:
+            offsets: Масив зсувів довжини n + 1.
+            targets: Масив номерів кінцевих вершин ребер.
+            weights: Масив ваг ребер.
+            names: Імена вершин у порядку їхніх номерів, або функція без аргументів,
+                що їх повертає. Якщо не задано, іменами є номери вершин.
+        """
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.targets = np.asarray(targets, dtype=np.int64)
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self._names = names
+        self._ids = None
+
+    @property
+    def names(self):
+        """
+        Повертає список імен вершин у порядку їхніх номерів.
+        """
+        if self._names is None:
+            self._names = list(range(self.num_vertices))
+        elif callable(self._names):
+            self._names = self._names()
+        elif not isinstance(self._names, list):
+            self._names = list(self._names)
+        return self._names
+
+    @property
+    def ids(self):
+        """
+        Повертає словник "ім'я вершини -> номер".
+        """
+        if self._ids is None:
+            self._ids = {name: vertex_id for vertex_id, name in enumerate(self.names)}
+        return self._ids
+
+    @classmethod
+    def from_dict(cls, graph: dict):
+        """
+        Створює граф CSR зі словника у форматі, який приймає dijkstra.
+
+        Args:
+            graph: Граф у форматі словника з вагами ребер.
+
+        Returns:
+            CSRGraph: Компактний граф з тими самими вершинами та ребрами.
+        """
+        names = list(graph)
+        ids = {name: vertex_id for vertex_id, name in enumerate(names)}
+        # вершини, що трапляються лише як кінці ребер, отримують номери після решти
+        for neighbors in graph.values():
+            for neighbor in neighbors:
+                if neighbor not in ids:
+                    ids[neighbor] = len(names)
+                    names.append(neighbor)
+
+        offsets = np.zeros(len(names) + 1, dtype=np.int64)
+        for name, neighbors in graph.items():
+            offsets[ids[name] + 1] = len(neighbors)
+        np.cumsum(offsets, out=offsets)
+
+        targets = np.empty(offsets[-1], dtype=np.int64)
+        weights = np.empty(offsets[-1], dtype=np.float64)
+        for name, neighbors in graph.items():
+            start = offsets[ids[name]]
+            targets[start:start + len(neighbors)] = [ids[neighbor] for neighbor in neighbors]
+            weights[start:start + len(neighbors)] = list(neighbors.values())
+        return cls(offsets, targets, weights, names)
+
+    @classmethod
+    def from_edge_list(cls, path, delimiter=None, directed=True):
+        """
+        Будує граф CSR з текстового файлу зі списком ребер.
+
+        Кожен рядок файлу має вигляд "початок кінець [вага]" (вага за замовчуванням 1).
+        Порожні рядки та рядки, що починаються з '#', пропускаються. Файл читається
+        построково, а ребра накопичуються у типізованих масивах (24 байти на ребро),
+        тож пам'ять не залежить від кількості рядків Python-об'єктів.
+
+        Args:
+            path: Шлях до файлу.
+            delimiter: Роздільник полів (за замовчуванням - будь-які пробільні символи).
+            directed: Якщо False, кожне ребро додається в обох напрямках.
+
+        Returns:
+            CSRGraph: Граф з вершинами у порядку першої появи у файлі.
+        """
+        ids = {}
+        sources, targets, weights = array("q"), array("q"), array("d")
+        with open(path, encoding="utf-8") as file:
+            for line in file:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                fields = line.split(delimiter)
+                source = ids.setdefault(fields[0], len(ids))
+                target = ids.setdefault(fields[1], len(ids))
+                weight = float(fields[2]) if len(fields) > 2 else 1.0
+                sources.append(source)
+                targets.append(target)
+                weights.append(weight)
+                if not directed:
+                    sources.append(target)
+                    targets.append(source)
+                    weights.append(weight)
+
+        sources = np.frombuffer(sources, dtype=np.int64)
+        # стійке сортування зберігає порядок ребер кожної вершини як у файлі
+        order = np.argsort(sources, kind="stable")
+        offsets = np.zeros(len(ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=len(ids)), out=offsets[1:])
+        return cls(
+            offsets,
+            np.frombuffer(targets, dtype=np.int64)[order],
+            np.frombuffer(weights, dtype=np.float64)[order],
+            list(ids),
+        )
+
+    def save(self, path):
+        """
+        Зберігає граф у бінарному файлі, який можна відкрити через load.
+
+        Файл містить заголовок (сигнатура, кількість вершин і ребер, зсув і тип блоку
+        імен), далі масиви offsets, targets та weights у порядку little-endian і
+        наприкінці імена вершин у форматі _encode_names: цілі імена - масивом int64,
+        рядкові - довжинами в байтах і UTF-8 текстом.
+
+        Args:
+            path: Шлях до файлу.
+
+        Raises:
+            TypeError: Якщо імена вершин не є всі рядками або всі цілими числами.
+        """
+        names_kind, names_block = _encode_names(self.names, "CSRGraph.save")
+
+        with open(path, "wb") as file:
+            names_offset = _GRAPH_HEADER + 8 * (self.num_vertices + 1 + 2 * self.num_edges)
+            file.write(_GRAPH_MAGIC)
+            file.write(np.array([self.num_vertices, self.num_edges, names_offset, names_kind], dtype="<i8").tobytes())
+            for values, dtype in ((self.offsets, "<i8"), (self.targets, "<i8"), (self.weights, "<f8")):
+                file.write(np.ascontiguousarray(values, dtype=dtype).tobytes())
+            file.write(names_block)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Відкриває граф, збережений через save.
+
+        Args:
+            path: Шлях до файлу.
+            mmap: Якщо True, масиви відображаються у пам'ять (np.memmap) і читаються
+                з диска лише при зверненні; інакше завантажуються повністю.
+
+        Returns:
+            CSRGraph: Граф з ліниво прочитаними іменами вершин.
+        """
+        with open(path, "rb") as file:
+            header = file.read(_GRAPH_HEADER)
+        if header[:len(_GRAPH_MAGIC)] != _GRAPH_MAGIC:
+            raise ValueError(f"{path} не є файлом графа CSRGraph")
+        num_vertices, num_edges, names_offset, names_kind = np.frombuffer(
+            header, dtype="<i8", offset=len(_GRAPH_MAGIC)
+        ).tolist()
+
+        def read(dtype, offset, count):
+            if mmap:
+                return np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(count,))
+            return np.fromfile(path, dtype=dtype, count=count, offset=offset)
+
+        def read_names():
+            with open(path, "rb") as file:
+                file.seek(names_offset)
+                return _decode_names(names_kind, file.read(), num_vertices)
+
+        offsets = read("<i8", _GRAPH_HEADER, num_vertices + 1)
+        targets = read("<i8", _GRAPH_HEADER + 8 * (num_vertices + 1), num_edges)
+        weights = read("<f8", _GRAPH_HEADER + 8 * (num_vertices + 1 + num_edges), num_edges)
+        return cls(offsets, targets, weights, read_names)
+
+    @property
+    def num_vertices(self):
+        """
+        Повертає кількість вершин графа.
+        """
+        return len(self.offsets) - 1
+
+    @property
+    def num_edges(self):
+        """
+        Повертає кількість ребер графа.
+        """
+        return len(self.targets)
+
+    def adjacency_views(self):
+        """
+        Повертає масиви CSR у вигляді memoryview для швидкого поелементного доступу.
+
+        Звернення до окремих елементів масиву NumPy у циклі Python створює скаляр
+        NumPy і значно повільніше, а memoryview повертає звичайні int та float майже
+        так само швидко, як список. При цьому дані не копіюються: список Python
+        займав би близько 70 байтів на ребро замість 16, а для графа з load
+        memoryview читає з диска лише ті сторінки, до яких звертається пошук.
+
+        Returns:
+            tuple: memoryview над offsets, targets та weights.
+        """
+        return (
+            memoryview(np.ascontiguousarray(self.offsets)),
+            memoryview(np.ascontiguousarray(self.targets)),
+            memoryview(np.ascontiguousarray(self.weights)),
+        )
+
+    def to_dict(self, values):
+        """
+        Перетворює масив значень по вершинах на словник з іменами вершин.
+
+        Args:
+            values: Масив довжини n (наприклад, відстані з dijkstra_csr).
+
+        Returns:
+            dict: Словник "ім'я вершини -> значення".
+        """
+        return dict(zip(self.names, values.tolist()))
+
+
+def dijkstra_csr(graph: CSRGraph, start, arity=None):
+    """
+    Реалізація алгоритму Дейкстри над компактним графом CSR.
+
+    Ребра читаються безпосередньо з масивів графа (див. CSRGraph.adjacency_views);
+    додаткова пам'ять - лише списки відстаней і попередників довжини n та черга.
+
+    Args:
+        graph: Граф у форматі CSRGraph.
+        start: Ім'я початкової вершини.
+        arity: Якщо задано, замість heapq з лінивим видаленням використовується
+            IndexedDaryHeap з такою арністю та справжньою операцією decrease-key.
+
+    Returns:
+        tuple: Масив найкоротших відстаней (inf для недосяжних вершин) та масив
+            попередників на найкоротших шляхах (-1 для початкової та недосяжних вершин).
+    """
+    if arity is None:
+        distances, predecessors = _dijkstra_lists(*graph.adjacency_views(), graph.ids[start])
+    else:
+        distances, predecessors = _dijkstra_indexed_lists(
+            *graph.adjacency_views(), graph.ids[start], arity
+        )
+    return np.array(distances), np.array(predecessors, dtype=np.int64)
+
+
+def _dijkstra_lists(offsets, targets, weights, source, stats=None):
+    """
+    Ядро алгоритму Дейкстри над масивами CSR.
+
+    Масиви передаються як послідовності з швидким поелементним доступом - memoryview
+    (див. CSRGraph.adjacency_views) або списки Python.
+
+    Args:
+        offsets: Зсуви довжини n + 1.
+        targets: Номери кінцевих вершин ребер.
+        weights: Ваги ребер.
+        source: Номер початкової вершини.
+        stats: Необов'язковий словник для кількості вставок у чергу ("pushes")
+            та її найбільшого розміру ("max_queue").
+
+    Returns:
+        tuple: Списки відстаней та попередників.
+    """
+    distances = [float("infinity")] * (len(offsets) - 1)
+    predecessors = [-1] * (len(offsets) - 1)
+    distances[source] = 0.0
+    priority_queue = [(0.0, source)]
+    pushes = max_queue = 1
+
+    while priority_queue:
+        current_distance, current_vertex = heapq.heappop(priority_queue)
+
+        if current_distance > distances[current_vertex]:
+            continue
+
+        first, last = offsets[current_vertex], offsets[current_vertex + 1]
+        for neighbor, weight in zip(targets[first:last], weights[first:last]):
+            distance = current_distance + weight
+
+            if distance < distances[neighbor]:
+                distances[neighbor] = distance
+                predecessors[neighbor] = current_vertex
+                heapq.heappush(priority_queue, (distance, neighbor))
+                pushes += 1
+                if len(priority_queue) > max_queue:
+                    max_queue = len(priority_queue)
+
+    if stats is not None:
+        stats["pushes"], stats["max_queue"] = pushes, max_queue
+    return distances, predecessors
+
+
+class IndexedDaryHeap:
+    """
+    Індексована d-арна мінімальна купа для цілих номерів вершин 0..capacity-1.
+
+    Купа зберігається у списках: heap містить вершини, keys - їхні ключі, а positions -
+    позицію кожної вершини в heap (-1, якщо її там немає). Кожна вершина присутня
+    не більше одного разу, тож розмір купи не перевищує кількості вершин, а
+    decrease_key змінює наявний запис замість додавання нового.
+    """
+
+    def __init__(self, capacity, arity=4):
+        """
+        Ініціалізує порожню купу.
+
+        Args:
+            capacity: Кількість можливих вершин.
+            arity: Кількість нащадків кожного вузла купи.
+        """
+        self.arity = arity
+        self.heap = []
+        self.keys = [float("infinity")] * capacity
+        self.positions = [-1] * capacity
+
+    def __len__(self):
+        """
+        Повертає кількість вершин у купі.
+        """
+        return len(self.heap)
+
+    def __contains__(self, vertex):
+        """
+        Перевіряє, чи є вершина в купі.
+        """
+        return self.positions[vertex] >= 0
+
+    def _sift_up(self, index):
+        """
+        Піднімає елемент на позиції index, доки його предок не стане меншим.
+        """
+        heap, keys, positions, arity = self.heap, self.keys, self.positions, self.arity
+        vertex = heap[index]
+        key = keys[vertex]
+        while index > 0:
+            parent_index = (index - 1) // arity
+            parent = heap[parent_index]
+            if keys[parent] <= key:
+                break
+            heap[index] = parent
+            positions[parent] = index
+            index = parent_index
+        heap[index] = vertex
+        positions[vertex] = index
+
+    def _sift_down(self, index):
+        """
+        Опускає елемент на позиції index, доки він не стане меншим за всіх нащадків.
+        """
+        heap, keys, positions, arity = self.heap, self.keys, self.positions, self.arity
+        size = len(heap)
+        vertex = heap[index]
+        key = keys[vertex]
+        while True:
+            first_child = index * arity + 1
+            if first_child >= size:
+                break
+            best_index = first_child
+            best_key = keys[heap[first_child]]
+            for child_index in range(first_child + 1, min(first_child + arity, size)):
+                child_key = keys[heap[child_index]]
+                if child_key < best_key:
+                    best_index, best_key = child_index, child_key
+            if best_key >= key:
+                break
+            child = heap[best_index]
+            heap[index] = child
+            positions[child] = index
+            index = best_index
+        heap[index] = vertex
+        positions[vertex] = index
+
+    def push(self, vertex, key):
+        """
+        Додає вершину з ключем key.
+
+        Args:
+            vertex: Номер вершини, якої ще немає в купі.
+            key: Ключ вершини.
+        """
+        self.keys[vertex] = key
+        self.heap.append(vertex)
+        self._sift_up(len(self.heap) - 1)
+
+    def decrease_key(self, vertex, key):
+        """
+        Зменшує ключ вершини, що вже є в купі.
+
+        Args:
+            vertex: Номер вершини.
+            key: Новий ключ, не більший за поточний.
+        """
+        self.keys[vertex] = key
+        self._sift_up(self.positions[vertex])
+
+    def pop(self):
+        """
+        Видаляє та повертає вершину з найменшим ключем.
+
+        Returns:
+            tuple: Ключ та номер вершини.
+        """
+        heap = self.heap
+        vertex = heap[0]
+        last = heap.pop()
+        self.positions[vertex] = -1
+        if heap:
+            heap[0] = last
+            self._sift_down(0)
+        return self.keys[vertex], vertex
+
+
+def _dijkstra_indexed_lists(offsets, targets, weights, source, arity=4, stats=None):
+    """
+    Ядро алгоритму Дейкстри з IndexedDaryHeap замість heapq.
+
+    Аргументи та результат такі самі, як у _dijkstra_lists.
+    """
+    distances = [float("infinity")] * (len(offsets) - 1)
+    predecessors = [-1] * (len(offsets) - 1)
+    distances[source] = 0.0
+    queue = IndexedDaryHeap(len(distances), arity)
+    queue.push(source, 0.0)
+    pushes = max_queue = 1
+
+    while queue.heap:
+        current_distance, current_vertex = queue.pop()
+
+        first, last = offsets[current_vertex], offsets[current_vertex + 1]
+        for neighbor, weight in zip(targets[first:last], weights[first:last]):
+            distance = current_distance + weight
+
+            if distance < distances[neighbor]:
+                distances[neighbor] = distance
+                predecessors[neighbor] = current_vertex
+                if queue.positions[neighbor] >= 0:
+                    queue.decrease_key(neighbor, distance)
+                else:
+                    queue.push(neighbor, distance)
+                    pushes += 1
+                    if len(queue.heap) > max_queue:
+                        max_queue = len(queue.heap)
+
+    if stats is not None:
+        stats["pushes"], stats["max_queue"] = pushes, max_queue
+    return distances, predecessors
+
+
+def benchmark_heaps(vertices=2_000, density=0.5, arity=4, seed=42):
+    """
+    Порівнює heapq з лінивим видаленням та IndexedDaryHeap у алгоритмі Дейкстри
+    на щільному випадковому графі: розмір черги, кількість вставок (кожна вставка
+    в heapq створює новий кортеж), пікове виділення пам'яті та час.
+
+    Args:
+        vertices: Кількість вершин.
+        density: Імовірність наявності кожного ребра.
+        arity: Арність IndexedDaryHeap.
+        seed: Початкове значення генератора випадкових чисел.
+    """
+    rng = np.random.default_rng(seed)
+    mask = rng.random((vertices, vertices)) < density
+    np.fill_diagonal(mask, False)
+    sources, targets = np.nonzero(mask)
+    offsets = np.zeros(vertices + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=vertices), out=offsets[1:])
+    graph = CSRGraph(offsets, targets, rng.random(len(targets)) * 100, range(vertices))
+    views = graph.adjacency_views()
+    print(f"Граф: {graph.num_vertices} вершин, {graph.num_edges} ребер")
+
+    print(f"{'черга':>12} {'вставок':>10} {'макс. розмір':>13} {'пік пам., КБ':>13} {'час, с':>8}")
+    results = []
+    for name, run in (
+        ("heapq", lambda stats: _dijkstra_lists(*views, 0, stats)),
+        (f"{arity}-арна", lambda stats: _dijkstra_indexed_lists(*views, 0, arity, stats)),
+    ):
+        stats = {}
+        start = time.perf_counter()
+        run(stats)
+        elapsed = time.perf_counter() - start
+
+        tracemalloc.start()
+        results.append(run({})[0])
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"{name:>12} {stats['pushes']:>10} {stats['max_queue']:>13} "
+              f"{peak / 1024:>13.0f} {elapsed:>8.3f}")
+    assert results[0] == results[1]
+
+
+# стан процесу-обробника пакетного пошуку: представлення CSR та матриця результатів
+_worker_state = {}
+
+
+def _share_array(array, stack):
+    """
+    Копіює масив у новий блок спільної пам'яті.
+
+    Args:
+        array: Масив NumPy.
+        stack: contextlib.ExitStack, що звільнить блок після завершення роботи.
+
+    Returns:
+        tuple: Опис блоку (ім'я, форма, тип), за яким його відкривають обробники,
+            та масив NumPy поверх спільної пам'яті.
+    """
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    stack.callback(block.unlink)
+    stack.callback(block.close)
+    shared = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+    shared[...] = array
+    return (block.name, array.shape, array.dtype.str), shared
+
+
+def _attach_array(spec):
+    """
+    Відкриває блок спільної пам'яті, створений _share_array.
+
+    Returns:
+        tuple: Об'єкт SharedMemory та масив NumPy поверх нього.
+    """
+    name, shape, dtype = spec
+    block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+
+def _init_worker(graph_specs, result_spec):
+    """
+    Ініціалізує процес-обробник: підключає граф зі спільної пам'яті один раз на процес.
+
+    Обробник читає ребра через memoryview прямо зі спільних блоків, не створюючи
+    власної копії графа, тож пам'ять обробника не залежить від кількості ребер.
+
+    Args:
+        graph_specs: Описи блоків offsets, targets та weights.
+        result_spec: Опис блоку матриці результатів або None для потокового режиму.
+    """
+    blocks = []
+    views = []
+    for spec in graph_specs:
+        block, array = _attach_array(spec)
+        blocks.append(block)
+        views.append(memoryview(array))
+    _worker_state["views"] = views
+    _worker_state["blocks"] = blocks
+    if result_spec is not None:
+        block, result = _attach_array(result_spec)
+        blocks.append(block)
+        _worker_state["result"] = result
+
+
+def _fill_row(task):
+    """
+    Обчислює відстані від однієї вершини та записує їх у рядок спільної матриці.
+
+    Args:
+        task: Пара (номер рядка, номер початкової вершини).
+    """
+    row, source = task
+    _worker_state["result"][row] = _dijkstra_lists(*_worker_state["views"], source)[0]
+
+
+def _distance_row(source):
+    """
+    Обчислює відстані від однієї вершини та повертає їх процесу-власнику.
+    """
+    return np.array(_dijkstra_lists(*_worker_state["views"], source)[0])
+
+
+def multi_source_dijkstra(graph: CSRGraph, sources, processes=None):
+    """
+    Пакетний пошук найкоротших відстаней від багатьох вершин у пулі процесів.
+
+    Масиви графа один раз копіюються у спільну пам'ять і не серіалізуються для
+    кожної задачі; обробники записують рядки відразу у спільну матрицю результатів.
+
+    Args:
+        graph: Граф у форматі CSRGraph.
+        sources: Імена початкових вершин.
+        processes: Кількість процесів (за замовчуванням - кількість ядер).
+
+    Returns:
+        Масив форми (len(sources), n) з відстанями; рядок i відповідає sources[i].
+    """
+    source_ids = [graph.ids[source] for source in sources]
+    processes = processes or os.cpu_count()
+    with contextlib.ExitStack() as stack:
+        graph_specs = [
+            _share_array(array, stack)[0]
+            for array in (graph.offsets, graph.targets, graph.weights)
+        ]
+        result_spec, result = _share_array(
+            np.empty((len(source_ids), graph.num_vertices)), stack
+        )
+        with multiprocessing.Pool(processes, _init_worker, (graph_specs, result_spec)) as pool:
+            chunksize = max(1, len(source_ids) // (4 * processes))
+            for _ in pool.imap_unordered(_fill_row, enumerate(source_ids), chunksize):
+                pass
+        return result.copy()
+
+
+def iter_multi_source_dijkstra(graph: CSRGraph, sources, processes=None):
+    """
+    Потоковий варіант multi_source_dijkstra: повертає рядки відстаней по мірі готовності
+    у порядку sources, не тримаючи всю матрицю в пам'яті.
+
+    Args:
+        graph: Граф у форматі CSRGraph.
+        sources: Імена початкових вершин.
+        processes: Кількість процесів (за замовчуванням - кількість ядер).
+
+    Yields:
+        Пари (ім'я початкової вершини, масив відстаней).
+    """
+    sources = list(sources)
+    with contextlib.ExitStack() as stack:
+        graph_specs = [
+            _share_array(array, stack)[0]
+            for array in (graph.offsets, graph.targets, graph.weights)
+        ]
+        with multiprocessing.Pool(processes, _init_worker, (graph_specs, None)) as pool:
+            rows = pool.imap(_distance_row, [graph.ids[source] for source in sources])
+            yield from zip(sources, rows)
+
+
 def visualize_graph(graph, shortest_distances, start_node):
     """
     Функція для візуалізації направленого графа з позначенням найкоротших шляхів від заданої початкової вершини.
@@ -90,7 +1375,180 @@ def visualize_graph(graph, shortest_distances, start_node):
     plt.title("Граф з найкоротшими шляхами від вершини " + start_node)
     plt.show()
 
-if __name__ == "__main__":
+class GraphRenderer:
+    """
+    Візуалізація великих графів: граф networkx та розташування вершин будуються
+    один раз і повторно використовуються для всіх наступних рисунків.
+    """
+
+    def __init__(self, graph: dict, layout="circular", label_threshold=60, seed=None):
+        """
+        Ініціалізує рендерер.
+
+        Args:
+            graph: Граф у форматі словника з вагами ребер.
+            layout: Алгоритм розташування: "circular", "spring" або "random".
+            label_threshold: Максимальна кількість вершин (ребер), для якої ще
+                малюються підписи вершин (ваг ребер).
+            seed: Початкове значення генератора для "spring" та "random".
+        """
+        self.graph = graph
+        self.layout = layout
+        self.label_threshold = label_threshold
+        self.seed = seed
+        self.nx_graph = nx.DiGraph()
+        self.nx_graph.add_nodes_from(graph)
+        self.nx_graph.add_weighted_edges_from(
+            (node, neighbor, weight)
+            for node, neighbors in graph.items()
+            for neighbor, weight in neighbors.items()
+        )
+        self._pos = None
+
+    @property
+    def pos(self):
+        """
+        Повертає (і кешує) словник координат вершин.
+        """
+        if self._pos is None:
+            if self.layout == "spring":
+                self._pos = nx.spring_layout(self.nx_graph, seed=self.seed)
+            elif self.layout == "random":
+                self._pos = nx.random_layout(self.nx_graph, seed=self.seed)
+            else:
+                self._pos = nx.circular_layout(self.nx_graph)
+        return self._pos
+
+    def _tree_edges(self, shortest_distances):
+        """
+        Вибирає для кожної досяжної вершини одне вхідне ребро дерева найкоротших шляхів.
+        """
+        edges = {}
+        for node, neighbors in self.graph.items():
+            # inf + weight == inf, тож ребра між недосяжними вершинами пропускаються явно
+            if shortest_distances[node] == float("infinity"):
+                continue
+            for neighbor, weight in neighbors.items():
+                if neighbor not in edges and shortest_distances[node] + weight == shortest_distances[neighbor]:
+                    edges[neighbor] = (node, neighbor, weight)
+        return list(edges.values())
+
+    def _k_hop_edges(self, start_node, hops):
+        """
+        Повертає ребра між вершинами, досяжними зі start_node не більш ніж за hops кроків.
+        """
+        reached = {start_node}
+        frontier = [start_node]
+        for _ in range(hops):
+            frontier = [
+                neighbor
+                for node in frontier
+                for neighbor in self.graph.get(node, {})
+                if neighbor not in reached and not reached.add(neighbor)
+            ]
+        return [
+            (node, neighbor, weight)
+            for node in reached
+            for neighbor, weight in self.graph.get(node, {}).items()
+            if neighbor in reached
+        ]
+
+    def draw(self, shortest_distances=None, start_node=None, mode="full", hops=2, output=None):
+        """
+        Малює граф або його частину; напрямок кожного ребра позначається стрілкою.
+
+        Args:
+            shortest_distances: Словник відстаней від start_node (для підписів і режиму "tree").
+            start_node: Початкова вершина, що виділяється зеленим.
+            mode: "full" - усі ребра, "tree" - лише дерево найкоротших шляхів,
+                "khop" - окіл start_node радіусом hops.
+            hops: Радіус околу для режиму "khop".
+            output: Шлях до файлу зображення. Якщо задано, рисунок зберігається без
+                відкриття вікна; інакше викликається plt.show().
+
+        Returns:
+            None
+        """
+        if mode == "tree":
+            if shortest_distances is None:
+                shortest_distances = dijkstra(self.graph, start_node)
+            edges = self._tree_edges(shortest_distances)
+            nodes = [node for node in self.pos if shortest_distances.get(node, float("infinity")) < float("infinity")]
+        elif mode == "khop":
+            edges = self._k_hop_edges(start_node, hops)
+            nodes = list({start_node, *(node for edge in edges for node in edge[:2])})
+        else:
+            edges = [
+                (node, neighbor, weight)
+                for node, neighbors in self.graph.items()
+                for neighbor, weight in neighbors.items()
+            ]
+            nodes = list(self.pos)
+
+        if output is None:
+            _, ax = plt.subplots(figsize=(10, 10))
+        else:
+            ax = Figure(figsize=(10, 10)).subplots()
+        ax.axis("off")
+
+        pos = self.pos
+        # усі ребра та вершини малюються двома колекціями замість окремих об'єктів
+        segments = np.array([(pos[node], pos[neighbor]) for node, neighbor, _ in edges]).reshape(-1, 2, 2)
+        ax.add_collection(LineCollection(segments, colors="gray", linewidths=0.8, zorder=1))
+        if len(segments):
+            # напрямок ребер показують стрілки одного виклику quiver на відрізку 60-75% довжини,
+            # тож зустрічні ребра A -> B і B -> A не зливаються
+            small_edges = len(edges) <= self.label_threshold
+            tails = segments[:, 0] + 0.6 * (segments[:, 1] - segments[:, 0])
+            vectors = 0.15 * (segments[:, 1] - segments[:, 0])
+            ax.quiver(tails[:, 0], tails[:, 1], vectors[:, 0], vectors[:, 1], angles="xy", scale_units="xy",
+                      scale=1, color="dimgray", width=0.004 if small_edges else 0.0015,
+                      headwidth=4, headlength=5, headaxislength=4.5, zorder=1)
+        points = np.array([pos[node] for node in nodes]).reshape(-1, 2)
+        small = len(nodes) <= self.label_threshold
+        ax.scatter(points[:, 0], points[:, 1], s=300 if small else 10, c="yellow", edgecolors="black", zorder=2)
+        if start_node is not None:
+            ax.scatter(*pos[start_node], s=300 if small else 40, c="green", zorder=3)
+
+        if small:
+            for node in nodes:
+                ax.text(*pos[node], str(node), ha="center", va="center", fontweight="bold", zorder=4)
+                if shortest_distances is not None:
+                    ax.text(pos[node][0], pos[node][1] + 0.08, f"({start_node} -> {node}: {shortest_distances[node]})",
+                            ha="center", color="red", zorder=4)
+        if len(edges) <= self.label_threshold:
+            for node, neighbor, weight in edges:
+                middle = (np.asarray(pos[node]) + np.asarray(pos[neighbor])) / 2
+                ax.text(*middle, str(weight), ha="center", va="center", fontsize=8, zorder=4)
+
+        ax.autoscale_view()
+        if start_node is not None:
+            ax.set_title("Граф з найкоротшими шляхами від вершини " + str(start_node))
+        if output is None:
+            plt.show()
+        else:
+            ax.figure.savefig(output)
+
+
+if __name__ == "__main__" and "--benchmark" in sys.argv:
+    benchmark_queries()
+    benchmark_updates()
+    benchmark_heaps()
+elif __name__ == "__main__" and len(sys.argv) > 1:
+    # python task3.py <файл графа: .bin або список ребер> [початкова вершина]
+    graph_path = sys.argv[1]
+    with open(graph_path, "rb") as graph_file:
+        is_binary = graph_file.read(len(_GRAPH_MAGIC)) == _GRAPH_MAGIC
+    csr = CSRGraph.load(graph_path) if is_binary else CSRGraph.from_edge_list(graph_path)
+    start_node = csr.names[0]
+    if len(sys.argv) > 2:
+        # імена вершин з бінарного файлу можуть бути цілими числами
+        start_node = type(start_node)(sys.argv[2])
+    distances, _ = dijkstra_csr(csr, start_node)
+    reachable = np.isfinite(distances)
+    print(f"Вершин: {csr.num_vertices}, ребер: {csr.num_edges}")
+    print(f"Досяжно з {start_node}: {int(reachable.sum())}, найбільша відстань: {distances[reachable].max()}")
+elif __name__ == "__main__":
     graph = {
         "A": {"B": 5, "C": 10},
         "B": {"A": 5, "D": 3},
@@ -103,4 +1561,6 @@ if __name__ == "__main__":
     start_node = "A"
     shortest_distances = dijkstra(graph, start_node)
     print("Найкоротша відстань від ноди", start_node + ":", shortest_distances)
+    path, cost = shortest_path(graph, start_node, "F", bidirectional=True)
+    print("Найкоротший шлях", start_node, "-> F:", " -> ".join(path), f"(вартість {cost})")
     visualize_graph(graph, shortest_distances, start_node)
@@ -1,5 +1,14 @@
+import contextlib
 import heapq
+import os
+import sys
+import time
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.collections import EllipseCollection, LineCollection, PolyCollection
 
 def build_max_heap(nodes):
     """
@@ -16,41 +25,556 @@ def build_max_heap(nodes):
         heapq.heappush(max_heap, -item)
     return [-i for i in max_heap]
 
-def draw_node(ax, node, pos, node_radius=0.5):
+def _heapify_numpy(values):
     """
-    Функція для малювання вузла бінарного дерева.
+    Перетворює масив NumPy на максимальну купу на місці за O(N).
+
+    Класична побудова знизу вгору, але всі вузли одного рівня просіюються вниз
+    одночасно: їхні піддерева не перетинаються, тож обміни можна виконувати
+    векторно. Кількість викликів NumPy - O(log^2 N), загальна робота - O(N).
 
     Args:
-        ax: Вісь для малювання.
-        node: Значення вузла.
-        pos: Позиція вузла (координати).
-        node_radius: Радіус вузла.
+        values: Одновимірний масив NumPy.
+    """
+    size = len(values)
+    last_parent = size // 2 - 1
+    for level in range((last_parent + 1).bit_length() - 1, -1, -1):
+        positions = np.arange((1 << level) - 1, min((1 << (level + 1)) - 1, last_parent + 1))
+        while positions.size:
+            left = 2 * positions + 1
+            positions, left = positions[left < size], left[left < size]
+            right = np.minimum(left + 1, size - 1)
+            # більший з дітей; для вузла без правої дитини right == left
+            child = np.where(values[right] > values[left], right, left)
+            swap = values[child] > values[positions]
+            positions, child = positions[swap], child[swap]
+            parents = values[positions]
+            values[positions] = values[child]
+            values[child] = parents
+            positions = child
+
+
+class MaxHeap:
+    """
+    Максимальна бінарна купа.
+
+    Числові дані зберігаються в типізованому масиві array ("q" для цілих, "d" для
+    дійсних чисел), а купа для них будується векторно через NumPy. Решта значень
+    зберігається у звичайному списку.
+
+    Якщо тип сховища визначено автоматично, а новий елемент у нього не вміщується
+    (дійсне число в "q", ціле поза межами int64, bool тощо), сховище один раз
+    перетворюється на список, тож елементи зберігаються без зміни типу та значення.
+    """
+
+    def __init__(self, items=(), typecode=None):
+        """
+        Будує купу з заданих елементів за O(N).
+
+        Args:
+            items: Ітерований об'єкт з елементами (список, array або масив NumPy).
+            typecode: Код типу array для зберігання. Якщо задано (або items - це array),
+                елементи перетворюються до цього типу, як у самому array. Інакше тип
+                визначається автоматично: "q", якщо всі елементи мають тип int, "d",
+                якщо всі мають тип float, для масиву NumPy - за його dtype; у решті
+                випадків (і для порожньої купи) використовується список.
+        """
+        # тип, обраний користувачем, не змінюється; автоматичний може стати списком
+        self._fixed = typecode is not None or isinstance(items, array)
+        if typecode is not None:
+            if isinstance(items, np.ndarray):
+                self._data = array(typecode, np.ascontiguousarray(items, dtype=typecode).tobytes())
+            else:
+                self._data = array(typecode, items)
+        elif isinstance(items, array):
+            self._data = array(items.typecode, items)
+        elif isinstance(items, np.ndarray):
+            kind, itemsize = items.dtype.kind, items.dtype.itemsize
+            code = "q" if kind == "i" or (kind == "u" and itemsize < 8) else "d" if kind == "f" else None
+            if code is None:
+                self._data = items.tolist()
+            else:
+                self._data = array(code, np.ascontiguousarray(items, dtype=code).tobytes())
+        else:
+            items = items if isinstance(items, (list, tuple)) else list(items)
+            types = set(map(type, items))
+            self._data = list(items)
+            if types == {int}:
+                # цілі, що не вміщуються в "q", лишаються у списку без втрати точності
+                with contextlib.suppress(OverflowError):
+                    self._data = array("q", items)
+            elif types == {float}:
+                self._data = array("d", items)
+        self._heapify()
+
+    def _admit(self, item):
+        """
+        Перетворює автоматично обране типізоване сховище на список, якщо item у нього
+        не вміщується без зміни типу чи значення.
+        """
+        data = self._data
+        if self._fixed or not isinstance(data, array):
+            return
+        if data.typecode == "q":
+            fits = type(item) is int and -2**63 <= item < 2**63
+        else:
+            fits = type(item) is float
+        if not fits:
+            self._data = data.tolist()
+
+    def _heapify(self):
+        """
+        Відновлює властивість купи для всього сховища.
+        """
+        if isinstance(self._data, array):
+            if len(self._data) > 1:
+                view = np.frombuffer(self._data, dtype=self._data.typecode)
+                _heapify_numpy(view)
+                # масив array не можна змінювати, поки на нього є представлення NumPy
+                del view
+        else:
+            for pos in reversed(range(len(self._data) // 2)):
+                self._sift_down(pos)
+
+    def _sift_up(self, pos):
+        """
+        Піднімає елемент з позиції pos, доки він більший за батька.
+        """
+        data = self._data
+        item = data[pos]
+        while pos > 0:
+            parent = (pos - 1) >> 1
+            if not item > data[parent]:
+                break
+            data[pos] = data[parent]
+            pos = parent
+        data[pos] = item
+
+    def _sift_down(self, pos):
+        """
+        Опускає елемент з позиції pos, доки він менший за більшу з дітей.
+        """
+        data = self._data
+        size = len(data)
+        item = data[pos]
+        child = 2 * pos + 1
+        while child < size:
+            if child + 1 < size and data[child + 1] > data[child]:
+                child += 1
+            if not data[child] > item:
+                break
+            data[pos] = data[child]
+            pos = child
+            child = 2 * pos + 1
+        data[pos] = item
+
+    @property
+    def typecode(self):
+        """
+        Повертає код типу сховища array або None для списку.
+        """
+        return self._data.typecode if isinstance(self._data, array) else None
+
+    def __len__(self):
+        """
+        Повертає кількість елементів у купі.
+        """
+        return len(self._data)
+
+    def __getitem__(self, index):
+        """
+        Повертає елемент купи за індексом у порядку зберігання.
+
+        Args:
+            index: Індекс елемента (0 - найбільший елемент).
+        """
+        return self._data[index]
+
+    def __iter__(self):
+        """
+        Повертає ітератор по елементах купи в порядку зберігання (не відсортованому).
+        """
+        return iter(self._data)
+
+    def to_list(self):
+        """
+        Повертає елементи купи у вигляді списку в порядку зберігання.
+        """
+        return self._data.tolist() if isinstance(self._data, array) else list(self._data)
+
+    def peek(self):
+        """
+        Повертає найбільший елемент, не видаляючи його.
+        """
+        if not self._data:
+            raise IndexError("peek from empty heap")
+        return self._data[0]
+
+    def push(self, item):
+        """
+        Додає елемент до купи за O(log N).
+        """
+        self._admit(item)
+        self._data.append(item)
+        self._sift_up(len(self._data) - 1)
+
+    def pop(self):
+        """
+        Видаляє та повертає найбільший елемент за O(log N).
+        """
+        if not self._data:
+            raise IndexError("pop from empty heap")
+        last = self._data.pop()
+        if not self._data:
+            return last
+        top = self._data[0]
+        self._data[0] = last
+        self._sift_down(0)
+        return top
+
+    def pushpop(self, item):
+        """
+        Додає елемент і видаляє найбільший; швидше, ніж push з наступним pop.
+        """
+        if self._data and self._data[0] > item:
+            self._admit(item)
+            item, self._data[0] = self._data[0], item
+            self._sift_down(0)
+        return item
+
+    def replace(self, item):
+        """
+        Видаляє найбільший елемент і додає новий; швидше, ніж pop з наступним push.
+        """
+        if not self._data:
+            raise IndexError("replace on empty heap")
+        self._admit(item)
+        top = self._data[0]
+        self._data[0] = item
+        self._sift_down(0)
+        return top
+
+    def nlargest(self, k):
+        """
+        Повертає k найбільших елементів у порядку спадання, не змінюючи купу.
+
+        Обхід іде від кореня, а кандидати (діти вже виданих вузлів) зберігаються
+        в допоміжній купі, тож складність - O(k log k) незалежно від розміру купи.
+
+        Args:
+            k: Кількість елементів.
+
+        Returns:
+            list: Найбільші елементи.
+        """
+        data = self._data
+        result = []
+        if k <= 0 or not data:
+            return result
+        candidates = MaxHeap([(data[0], 0)])
+        while candidates and len(result) < k:
+            # індекси зберігаються зі знаком мінус: при рівних значеннях першим
+            # виходить вузол з меншим індексом, а самі індекси лишаються унікальними
+            value, pos = candidates.pop()
+            result.append(value)
+            for child in (1 - 2 * pos, 2 - 2 * pos):
+                if child < len(data):
+                    candidates.push((data[child], -child))
+        return result
+
+
+class StreamingTopK:
+    """
+    Відбір k найбільших (або найменших) чисел з потоку з пам'яттю O(k).
+
+    Відібрані значення зберігаються в MaxHeap, на вершині якої лежить найгірше з
+    них - поточний поріг. Для пошуку найбільших значення зберігаються зі знаком
+    мінус, тож поріг завжди є максимумом купи.
+    """
+
+    def __init__(self, k, largest=True):
+        """
+        Ініціалізує порожній відбір.
+
+        Args:
+            k: Кількість значень, що зберігаються.
+            largest: True - відбирати найбільші значення, False - найменші.
+        """
+        self.k = k
+        self.largest = largest
+        self._sign = -1 if largest else 1
+        self._heap = MaxHeap()
+
+    def __len__(self):
+        """
+        Повертає кількість уже відібраних значень (не більше k).
+        """
+        return len(self._heap)
+
+    @property
+    def threshold(self):
+        """
+        Повертає найгірше з відібраних значень або None, поки відібрано менше k.
+        """
+        if not self.k or len(self._heap) < self.k:
+            return None
+        return self._sign * self._heap.peek()
+
+    def push(self, value):
+        """
+        Обробляє одне значення за O(log k).
+        """
+        value = self._sign * value
+        if len(self._heap) < self.k:
+            self._heap.push(value)
+        elif self.k:
+            self._heap.pushpop(value)
+
+    def update(self, values):
+        """
+        Обробляє ітерований об'єкт або масив NumPy.
+
+        Для масиву значення, гірші за поточний поріг, відкидаються векторно, а з
+        решти np.partition залишає не більше k кандидатів, тож у циклі Python
+        обробляється щонайбільше k значень на блок.
+
+        Args:
+            values: Ітерований об'єкт з числами або масив NumPy.
+        """
+        if not isinstance(values, np.ndarray):
+            for value in values:
+                self.push(value)
+            return
+        if not self.k:
+            return
+
+        values = values.ravel()
+        threshold = self.threshold
+        if threshold is not None:
+            values = values[values > threshold] if self.largest else values[values < threshold]
+        if len(values) > self.k:
+            values = np.partition(values, len(values) - self.k)[-self.k:] if self.largest \
+                else np.partition(values, self.k - 1)[:self.k]
+        if not len(self._heap):
+            # перший блок одразу будує типізовану купу за O(k)
+            self._heap = MaxHeap(self._sign * values)
+        else:
+            for value in values.tolist():
+                self.push(value)
+
+    def result(self):
+        """
+        Повертає відібрані значення, відсортовані від найкращого.
+        """
+        return sorted((self._sign * value for value in self._heap), reverse=self.largest)
+
+
+def top_k(stream, k, largest=True):
+    """
+    Повертає k найбільших (або найменших) чисел потоку, не зберігаючи його в пам'яті.
+
+    Args:
+        stream: Ітерований об'єкт з числами або з блоками - масивами NumPy.
+        k: Кількість значень.
+        largest: True - найбільші значення, False - найменші.
 
     Returns:
-        None
+        list: Відібрані значення, відсортовані від найкращого.
+    """
+    selection = StreamingTopK(k, largest)
+    for item in stream:
+        if isinstance(item, np.ndarray):
+            selection.update(item)
+        else:
+            selection.push(item)
+    return selection.result()
+
+
+def bottom_k(stream, k):
+    """
+    Повертає k найменших чисел потоку; див. top_k.
+    """
+    return top_k(stream, k, largest=False)
+
+
+def _chunk_top_k(chunk, k, largest):
+    """
+    Відбирає k найкращих значень одного блоку (виконується в процесі-обробнику).
+    """
+    selection = StreamingTopK(k, largest)
+    selection.update(np.asarray(chunk))
+    return np.array(selection.result())
+
+
+def parallel_top_k(chunks, k, largest=True, processes=None):
+    """
+    Відбирає k найкращих значень з блоків, обробляючи кожен блок в окремому процесі.
+
+    Кожен обробник повертає не більше k значень свого блоку, а головний процес
+    зливає ці часткові результати тим самим відбором з порогом. Одночасно в роботі
+    перебуває не більше 2 * processes блоків, тож потік блоків читається поступово.
+
+    Args:
+        chunks: Ітерований об'єкт з масивами NumPy.
+        k: Кількість значень.
+        largest: True - найбільші значення, False - найменші.
+        processes: Кількість процесів (за замовчуванням - кількість ядер).
+
+    Returns:
+        list: Відібрані значення, відсортовані від найкращого.
+    """
+    processes = processes or os.cpu_count()
+    selection = StreamingTopK(k, largest)
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_chunk_top_k, chunk, k, largest))
+            if len(pending) >= 2 * processes:
+                selection.update(pending.popleft().result())
+        while pending:
+            selection.update(pending.popleft().result())
+    return selection.result()
+
+
+def benchmark_heap(sizes=(10**6, 10**7), seed=42):
+    """
+    Порівнює build_max_heap (N викликів heappush з подвійним запереченням) з MaxHeap
+    на випадкових цілих числах: побудова зі списку Python та з масиву NumPy.
+
+    Args:
+        sizes: Кількості елементів.
+        seed: Початкове значення генератора випадкових чисел.
+    """
+    rng = np.random.default_rng(seed)
+    print(f"{'N':>10} {'build_max_heap, с':>18} {'MaxHeap(list), с':>17} {'MaxHeap(ndarray), с':>20}")
+    for size in sizes:
+        values = rng.integers(0, 10**9, size)
+        items = values.tolist()
+        timings = []
+        for build, source in ((build_max_heap, items), (MaxHeap, items), (MaxHeap, values)):
+            start = time.perf_counter()
+            heap = build(source)
+            timings.append(time.perf_counter() - start)
+            assert heap[0] == values.max()
+            del heap
+        print(f"{size:>10} {timings[0]:>18.3f} {timings[1]:>17.3f} {timings[2]:>20.3f}")
+
+
+def tree_layout(size, node_idx=0, pos=(0, 0), level=0, width=4, max_depth=None):
+    """
+    Обчислює координати всіх вузлів піддерева купи одразу, рівень за рівнем.
+
+    Вузол на глибині d з порядковим номером k серед вузлів цієї глибини має
+    x = pos[0] + width / 2 ** (level + 0.5) * ((2k + 1) * 2 ** (1 - d) - 2),
+    що збігається з позиціями, які отримує рекурсивне малювання.
+
+    Args:
+        size: Кількість елементів купи.
+        node_idx: Індекс кореня піддерева.
+        pos: Позиція кореня піддерева.
+        level: Рівень кореня піддерева.
+        width: Ширина дерева.
+        max_depth: Найбільша глибина (відносно кореня), що враховується.
+
+    Returns:
+        tuple: Масиви індексів вузлів, координат x та y, глибин вузлів, а також
+            масив відрізків (M, 2, 2) від батьків до дітей.
     """
-    circle = plt.Circle(pos, node_radius, color="yellow", ec="black", lw=1.5, zorder=4)
-    ax.add_patch(circle)
-    plt.text(*pos, int(node), ha="center", va="center", zorder=5)
+    indices, xs, depths, segments = [], [], [], []
+    previous = None
+    depth, first = 0, node_idx
+    while first < size and (max_depth is None or depth <= max_depth):
+        count = min(1 << depth, size - first)
+        order = np.arange(count)
+        x = pos[0] + width / 2 ** (level + 0.5) * ((2 * order + 1) * 2.0 ** (1 - depth) - 2)
+        if previous is not None:
+            parents = previous[order // 2]
+            segments.append(np.stack([parents, np.full(count, pos[1] - 2 * depth + 2.0),
+                                      x, np.full(count, pos[1] - 2.0 * depth)], axis=1))
+        indices.append(first + order)
+        xs.append(x)
+        depths.append(np.full(count, depth))
+        previous = x
+        depth, first = depth + 1, 2 * first + 1
+
+    if not indices:
+        empty = np.empty(0)
+        return empty.astype(np.int64), empty, empty, empty.astype(np.int64), empty.reshape(0, 2, 2)
+    depths = np.concatenate(depths)
+    segments = np.concatenate(segments).reshape(-1, 2, 2) if segments else np.empty((0, 2, 2))
+    return np.concatenate(indices), np.concatenate(xs), pos[1] - 2.0 * depths, depths, segments
 
-def draw_line(ax, pos1, pos2):
+
+def draw_heap_tree(
+    heap, ax, node_idx=0, pos=(0, 0), level=0, width=4, max_depth=None,
+    facecolors="yellow", edge_color="green", label=str,
+):
     """
-    Функція для малювання лінії між двома вузлами.
+    Малює дерево купи трьома колекціями: ребра, вузли та згорнуті піддерева.
+
+    Радіус вузлів зменшується з глибиною, щоб сусідні вузли не перекривалися;
+    підпис малюється лише тоді, коли він вміщується у вузол за поточних меж осей.
+    Піддерева нижче max_depth згортаються у сірі трикутники.
 
     Args:
+        heap: Бінарне дерево у вигляді списку (або MaxHeap).
         ax: Вісь для малювання.
-        pos1: Початкова позиція лінії (координати першого вузла).
-        pos2: Кінцева позиція лінії (координати другого вузла).
+        node_idx: Індекс кореня піддерева.
+        pos: Позиція кореня піддерева.
+        level: Рівень кореня піддерева.
+        width: Ширина дерева.
+        max_depth: Найбільша глибина, що малюється повністю.
+        facecolors: Колір вузлів або послідовність кольорів за індексами купи.
+        edge_color: Колір ребер.
+        label: Функція, що перетворює значення вузла на підпис.
 
     Returns:
-        None
+        tuple: Індекси намальованих вузлів, їхні координати (M, 2), радіуси,
+            товщини контурів та словник "індекс вузла -> підпис (Text)". Цього
+            досить, щоб згодом перемалювати окремі вузли поверх готового рисунка.
     """
-    line = plt.Line2D(
-        [pos1[0], pos2[0]], [pos1[1], pos2[1]], color="green", lw=1.5, zorder=3
-    )
-    ax.add_line(line)
+    indices, x, y, depths, segments = tree_layout(len(heap), node_idx, pos, level, width, max_depth)
+    if not len(indices):
+        return indices, np.empty((0, 2)), x, x, {}
+
+    # відстань між сусідніми вузлами на глибині d дорівнює width * 2 ** (1.5 - level - d)
+    radii = np.minimum(0.5, 0.45 * width * 2.0 ** (1.5 - level - depths))
+    line_widths = np.maximum(0.2, 3 * radii)
+    if not isinstance(facecolors, str):
+        facecolors = np.asarray(facecolors)[indices]
+
+    ax.add_collection(LineCollection(segments, colors=edge_color, linewidths=line_widths[1:], zorder=3))
+    ax.add_collection(EllipseCollection(
+        2 * radii, 2 * radii, 0, units="xy", offsets=np.column_stack([x, y]),
+        offset_transform=ax.transData, facecolors=facecolors, edgecolors="black",
+        linewidths=line_widths, zorder=4,
+    ))
+
+    collapsed = (depths == max_depth) & (2 * indices + 1 < len(heap))
+    if collapsed.any():
+        offset = width / 2 ** (level + max_depth + 0.5)
+        cx, cy = x[collapsed], y[collapsed]
+        triangles = np.stack([np.column_stack([cx, cy]), np.column_stack([cx - offset, cy - 2]),
+                              np.column_stack([cx + offset, cy - 2])], axis=1)
+        ax.add_collection(PolyCollection(triangles, facecolors="lightgray", edgecolors="gray", zorder=2))
 
-def plot_binary_tree(heap, ax, node_idx=0, pos=(0, 0), level=0, width=4):
+    # межі даних мають охоплювати вузли повністю, а не лише їхні центри
+    ax.update_datalim(np.column_stack([x - radii, y - radii]))
+    ax.update_datalim(np.column_stack([x + radii, y + radii]))
+    ax.autoscale_view()
+    # діаметр вузла в пунктах; ширина символу оцінюється як 0.6 розміру шрифту
+    scale = abs(ax.transData.transform((1, 0))[0] - ax.transData.transform((0, 0))[0])
+    diameters = 2 * radii * scale * 72 / ax.figure.dpi
+    char_width = 0.6 * plt.rcParams["font.size"]
+    labels = {}
+    for i in np.flatnonzero(diameters >= 2 * char_width):
+        text = label(heap[indices[i]])
+        if len(text) * char_width <= diameters[i]:
+            labels[int(indices[i])] = ax.text(x[i], y[i], text, ha="center", va="center", zorder=5)
+    return indices, np.column_stack([x, y]), radii, line_widths, labels
+
+
+def plot_binary_tree(heap, ax, node_idx=0, pos=(0, 0), level=0, width=4, max_depth=None):
     """
     Функція для малювання бінарного дерева.
 
@@ -61,39 +585,22 @@ def plot_binary_tree(heap, ax, node_idx=0, pos=(0, 0), level=0, width=4):
         pos: Початкова позиція поточного вузла.
         level: Рівень поточного вузла у дереві.
         width: Ширина дерева на поточному рівні.
+        max_depth: Найбільша глибина, що малюється повністю; глибші рівні згортаються.
 
     Returns:
         None
     """
-    if node_idx >= len(heap):
-        return
-
-    # обчислення горизонтальної позиції, щоб зберегти баланс дерева
-    x_offset = width / 2 ** (level + 0.5)
-    left_child_idx = 2 * node_idx + 1
-    right_child_idx = 2 * node_idx + 2
-
-    draw_node(ax, heap[node_idx], pos)
-
-    if left_child_idx < len(heap):
-        # рухаємося вниз та вліво
-        left_pos = (pos[0] - x_offset, pos[1] - 2)
-        draw_line(ax, pos, left_pos)
-        plot_binary_tree(heap, ax, left_child_idx, left_pos, level + 1, width)
-
-    if right_child_idx < len(heap):
-        # рухаємося вниз та вправо
-        right_pos = (pos[0] + x_offset, pos[1] - 2)
-        draw_line(ax, pos, right_pos)
-        plot_binary_tree(heap, ax, right_child_idx, right_pos, level + 1, width)
+    draw_heap_tree(heap, ax, node_idx, pos, level, width, max_depth, label=lambda node: str(int(node)))
 
-if __name__ == "__main__":
+if __name__ == "__main__" and "--benchmark" in sys.argv:
+    benchmark_heap()
+elif __name__ == "__main__":
     fig, ax = plt.subplots(figsize=(12, 8))
     ax.axis("off")
     plt.xlim(-10, 10)
     plt.ylim(-10, 2)
 
     data = [20, 18, 15, 30, 10, 5, 7, 9, 8, 2, 1, 4, 6, 66]
-    max_heap = build_max_heap(data)
+    max_heap = MaxHeap(data)
     plot_binary_tree(max_heap, ax)
     plt.show()
@@ -1,20 +1,17 @@
-import heapq
+import shutil
+import subprocess
+import sys
+import time
+from collections import deque
+from pathlib import Path
 import matplotlib.pyplot as plt
-
-def build_max_heap(nodes):
-    """
-    Функція для побудови максимальної бінарної купи з заданих вузлів.
-
-    Args:
-        nodes: Список вузлів, з яких будується купа.
-
-    Returns:
-        max_heap: Список, що представляє максимальну бінарну купу.
-    """
-    max_heap = []
-    for item in nodes:
-        heapq.heappush(max_heap, -item)
-    return [-i for i in max_heap]
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import EllipseCollection
+from matplotlib.colors import to_rgba_array
+from matplotlib.figure import Figure
+from PIL import GifImagePlugin, Image
+from task4 import MaxHeap, draw_heap_tree
 
 def generate_color(step, total_steps, start_color="#FEFF00", end_color="#FFA6F7"):
     """
@@ -42,42 +39,78 @@ def generate_color(step, total_steps, start_color="#FEFF00", end_color="#FFA6F7"
     mix_b = int(start_b + (end_b - start_b) * (step / total_steps))
     return f"#{mix_r:02x}{mix_g:02x}{mix_b:02x}"
 
-def draw_node(ax, node, pos, color="skyblue"):
+# перехід між лінійним RGB та OKLab (Björn Ottosson, 2020)
+_LMS_FROM_RGB = np.array([
+    [0.4122214708, 0.5363325363, 0.0514459929],
+    [0.2119034982, 0.6806995451, 0.1073969566],
+    [0.0883024619, 0.2817188376, 0.6299787005],
+])
+_OKLAB_FROM_LMS = np.array([
+    [0.2104542553, 0.7936177850, -0.0040720468],
+    [1.9779984951, -2.4285922050, 0.4505937099],
+    [0.0259040371, 0.7827717662, -0.8086757660],
+])
+_RGB_FROM_LMS = np.linalg.inv(_LMS_FROM_RGB)
+_LMS_FROM_OKLAB = np.linalg.inv(_OKLAB_FROM_LMS)
+
+def _srgb_to_oklab(rgb):
+    """
+    Перетворює масив кольорів sRGB (значення 0..1) на координати OKLab.
     """
-    Функція для малювання вузла бінарного дерева.
+    linear = np.where(rgb <= 0.04045, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+    return np.cbrt(linear @ _LMS_FROM_RGB.T) @ _OKLAB_FROM_LMS.T
+
+def _oklab_to_srgb(lab):
+    """
+    Перетворює масив координат OKLab на кольори sRGB (значення 0..1).
+    """
+    linear = (lab @ _LMS_FROM_OKLAB.T) ** 3 @ _RGB_FROM_LMS.T
+    linear = np.clip(linear, 0, 1)
+    return np.where(linear <= 0.0031308, linear * 12.92, 1.055 * linear ** (1 / 2.4) - 0.055)
+
+def gradient(steps, colors=("#FEFF00", "#FFA6F7"), space="rgb"):
+    """
+    Обчислює всю палітру градієнта одним векторним проходом.
+
+    Крок i отримує колір у точці i / steps, як і в generate_color; опорні кольори
+    розташовуються рівномірно від 0 до 1.
 
     Args:
-        ax: Вісь для малювання.
-        node: Значення вузла.
-        pos: Позиція вузла (координати).
-        color: Колір вузла.
+        steps: Кількість кольорів.
+        colors: Опорні кольори у шістнадцятковому форматі (два або більше).
+        space: "rgb" - інтерполяція в sRGB, "oklab" - у перцептивному просторі OKLab.
 
     Returns:
-        None
+        np.ndarray: Масив (steps, 3) з кольорами RGB у діапазоні 0..1.
     """
-    circle = plt.Circle(pos, 0.5, color=color, ec="black", lw=1.5, zorder=4)
-    ax.add_patch(circle)
-    plt.text(*pos, str(node), ha="center", va="center", zorder=5, color="black")
+    stops = np.array([[int(color[i:i + 2], 16) for i in (1, 3, 5)] for color in colors]) / 255
+    if space == "oklab":
+        stops = _srgb_to_oklab(stops)
+    positions = np.linspace(0, 1, len(stops))
+    t = np.arange(steps) / max(steps, 1)
+    palette = np.column_stack([np.interp(t, positions, stops[:, channel]) for channel in range(3)])
+    if space == "oklab":
+        palette = _oklab_to_srgb(palette)
+    return palette
 
-def draw_edge(ax, pos1, pos2):
+def visit_ranks(visit_order, size):
     """
-    Функція для малювання лінії між двома вузлами.
+    Повертає масив, де для кожного вузла записано його номер у порядку обходу (-1,
+    якщо вузол не відвідано), тож колір вузла знаходиться за O(1).
 
     Args:
-        ax: Вісь для малювання.
-        pos1: Початкова позиція лінії (координати першого вузла).
-        pos2: Кінцева позиція лінії (координати другого вузла).
+        visit_order: Порядок відвідування вузлів у дереві.
+        size: Кількість вузлів дерева.
 
     Returns:
-        None
+        np.ndarray: Масив рангів довжини size.
     """
-    line = plt.Line2D(
-        [pos1[0], pos2[0]], [pos1[1], pos2[1]], color="gray", lw=1.5, zorder=3
-    )
-    ax.add_line(line)
+    ranks = np.full(size, -1, dtype=np.int64)
+    ranks[np.asarray(visit_order, dtype=np.int64)] = np.arange(len(visit_order))
+    return ranks
 
 def plot_binary_tree(
-    heap, ax, visit_order, visit_colors, node_idx=0, pos=(0, 0), level=0, width=4
+    heap, ax, visit_order, visit_colors, node_idx=0, pos=(0, 0), level=0, width=4, max_depth=None
 ):
     """
     Функція для малювання бінарного дерева.
@@ -86,51 +119,95 @@ def plot_binary_tree(
         heap: Бінарне дерево у вигляді списку.
         ax: Вісь для малювання.
         visit_order: Порядок відвідування вузлів у дереві.
-        visit_colors: Кольори відвідуваних вузлів.
+        visit_colors: Кольори відвідуваних вузлів (список або масив, наприклад з gradient).
         node_idx: Індекс поточного вузла у списку.
         pos: Початкова позиція поточного вузла.
         level: Рівень поточного вузла у дереві.
         width: Ширина дерева на поточному рівні.
+        max_depth: Найбільша глибина, що малюється повністю; глибші рівні згортаються.
 
     Returns:
         None
     """
-    if node_idx >= len(heap):
-        return
-    x_offset = width / 2 ** (level + 0.5)
-    left_child_idx, right_child_idx = 2 * node_idx + 1, 2 * node_idx + 2
-    color = (
-        visit_colors[visit_order.index(node_idx)]
-        if node_idx in visit_order
-        else "skyblue"
-    )
-    draw_node(ax, heap[node_idx], pos, color=color)
-    if left_child_idx < len(heap):
-        left_pos = (pos[0] - x_offset, pos[1] - 2)
-        draw_edge(ax, pos, left_pos)
-        plot_binary_tree(
-            heap,
-            ax,
-            visit_order,
-            visit_colors,
-            left_child_idx,
-            left_pos,
-            level + 1,
-            width,
-        )
-    if right_child_idx < len(heap):
-        right_pos = (pos[0] + x_offset, pos[1] - 2)
-        draw_edge(ax, pos, right_pos)
-        plot_binary_tree(
-            heap,
-            ax,
-            visit_order,
-            visit_colors,
-            right_child_idx,
-            right_pos,
-            level + 1,
-            width,
-        )
+    # останній рядок палітри - колір невідвіданих вузлів, на нього вказує ранг -1
+    palette = np.vstack([to_rgba_array(visit_colors), to_rgba_array("skyblue")])
+    colors = palette[visit_ranks(visit_order, len(heap))]
+    draw_heap_tree(heap, ax, node_idx, pos, level, width, max_depth, facecolors=colors, edge_color="gray")
+
+def iter_dfs(heap, node_idx=0, order="pre", visited=None):
+    """
+    Лінивий ітеративний обхід бінарного дерева у глибину.
+
+    Замість рекурсії використовується явний стек, тож глибина дерева не обмежена
+    межею рекурсії. Від'ємне число ~idx у стеку означає "видати вузол idx", що
+    дозволяє одним циклом реалізувати прямий, симетричний та зворотний порядки.
+
+    Args:
+        heap: Бінарне дерево у вигляді списку.
+        node_idx: Індекс кореня обходу.
+        order: "pre" (прямий), "in" (симетричний) або "post" (зворотний) порядок.
+        visited: bytearray довжини len(heap) з позначками відвіданих вузлів;
+            позначені вузли пропускаються разом з їхніми піддеревами.
+
+    Yields:
+        int: Індекси вузлів у порядку відвідування.
+    """
+    size = len(heap)
+    if visited is None:
+        visited = bytearray(size)
+    stack = [node_idx]
+    while stack:
+        idx = stack.pop()
+        if idx < 0:
+            yield ~idx
+            continue
+        if idx >= size or visited[idx]:
+            continue
+        visited[idx] = 1
+        left_child_idx, right_child_idx = 2 * idx + 1, 2 * idx + 2
+        if order == "pre":
+            yield idx
+            stack.append(right_child_idx)
+            stack.append(left_child_idx)
+        elif order == "in":
+            stack.extend((right_child_idx, ~idx, left_child_idx))
+        else:
+            stack.extend((~idx, right_child_idx, left_child_idx))
+
+def iter_bfs(heap, node_idx=0, visited=None):
+    """
+    Лінивий обхід бінарного дерева у ширину (за рівнями) з чергою deque.
+
+    Args:
+        heap: Бінарне дерево у вигляді списку.
+        node_idx: Індекс кореня обходу.
+        visited: bytearray довжини len(heap) з позначками відвіданих вузлів.
+
+    Yields:
+        int: Індекси вузлів у порядку відвідування.
+    """
+    size = len(heap)
+    if visited is None:
+        visited = bytearray(size)
+    queue = deque([node_idx])
+    while queue:
+        idx = queue.popleft()
+        if idx >= size or visited[idx]:
+            continue
+        visited[idx] = 1
+        yield idx
+        queue.append(2 * idx + 1)
+        queue.append(2 * idx + 2)
+
+def _visited_from(heap, visit_order):
+    """
+    Будує bytearray відвіданих вузлів зі списку індексів.
+    """
+    visited = bytearray(len(heap))
+    for idx in visit_order:
+        if idx < len(heap):
+            visited[idx] = 1
+    return visited
 
 def dfs(heap, node_idx=0, visit_order=None):
     """
@@ -146,15 +223,7 @@ def dfs(heap, node_idx=0, visit_order=None):
     """
     if visit_order is None:
         visit_order = []
-    if node_idx >= len(heap) or node_idx in visit_order:
-        return
-    visit_order.append(node_idx)
-    left_child_idx = 2 * node_idx + 1
-    right_child_idx = 2 * node_idx + 2
-    if left_child_idx < len(heap):
-        dfs(heap, left_child_idx, visit_order)
-    if right_child_idx < len(heap):
-        dfs(heap, right_child_idx, visit_order)
+    visit_order.extend(iter_dfs(heap, node_idx, visited=_visited_from(heap, visit_order)))
     return visit_order
 
 def bfs(heap):
@@ -167,26 +236,219 @@ def bfs(heap):
     Returns:
         visit_order: Порядок відвідування вузлів у дереві.
     """
-    visit_order = []
-    queue = [0]
-    while queue:
-        node_idx = queue.pop(0)
-        if node_idx < len(heap) and node_idx not in visit_order:
-            visit_order.append(node_idx)
-            left_child_idx = 2 * node_idx + 1
-            right_child_idx = 2 * node_idx + 2
-            if left_child_idx < len(heap):
-                queue.append(left_child_idx)
-            if right_child_idx < len(heap):
-                queue.append(right_child_idx)
-    return visit_order
+    return list(iter_bfs(heap))
+
+def benchmark_traversals(sizes=(10**3, 10**4, 10**5, 10**6)):
+    """
+    Вимірює час обходів на купах різного розміру; час на вузол має лишатися сталим.
+
+    Args:
+        sizes: Кількості вузлів.
+    """
+    print(f"{'N':>9} " + " ".join(f"{name:>14}" for name in ("pre", "in", "post", "bfs")))
+    for size in sizes:
+        heap = range(size)
+        timings = []
+        for traverse in (
+            lambda: dfs(heap),
+            lambda: list(iter_dfs(heap, order="in")),
+            lambda: list(iter_dfs(heap, order="post")),
+            lambda: bfs(heap),
+        ):
+            start = time.perf_counter()
+            assert len(traverse()) == size
+            timings.append(time.perf_counter() - start)
+        print(f"{size:>9} " + " ".join(f"{t * 1e9 / size:>8.0f} нс/в." for t in timings))
+
+class _FrameWriter:
+    """
+    Записує кадри RGBA у GIF (Pillow), MP4 (ffmpeg через канал) або в каталог PNG.
+
+    Кожен кадр записується одразу, тож пам'ять не залежить від кількості кадрів.
+    Кадри GIF квантуються до однієї палітри (128 кольорів першого кадру та до 128
+    кольорів з extra_colors) і дописуються у файл по одному.
+    """
+
+    def __init__(self, output, fps, extra_colors=None):
+        """
+        Готує запис; файл відкривається (а ffmpeg запускається) при першому кадрі.
+
+        Args:
+            output: Шлях до файлу .gif чи .mp4 або до каталогу для кадрів PNG.
+            fps: Кількість кадрів за секунду.
+            extra_colors: Масив кольорів RGBA (0-1), які мають потрапити до палітри GIF.
+        """
+        self.output = Path(output)
+        self.fps = fps
+        self.count = 0
+        self.extra_colors = extra_colors
+        self._file = None
+        self._palette = None
+        self._process = None
+        if self.output.suffix.lower() not in (".gif", ".mp4"):
+            self.output.mkdir(parents=True, exist_ok=True)
+
+    def write(self, frame):
+        """
+        Записує один кадр - масив (висота, ширина, 4) з байтами RGBA.
+        """
+        suffix = self.output.suffix.lower()
+        if suffix == ".gif":
+            self._write_gif(Image.fromarray(frame).convert("RGB"))
+        elif suffix == ".mp4":
+            if self._process is None:
+                self._process = self._start_ffmpeg(frame.shape[1], frame.shape[0])
+            self._process.stdin.write(frame.tobytes())
+        else:
+            # швидке стиснення: кадрів багато, і саме кодування PNG домінує в часі кадру
+            Image.fromarray(frame).save(self.output / f"frame_{self.count:05d}.png", compress_level=1)
+        self.count += 1
+
+    def _write_gif(self, image):
+        """
+        Дописує кадр у GIF; перший кадр визначає палітру та заголовок файлу.
+
+        Args:
+            image: Кадр у режимі RGB.
+        """
+        if self._palette is None:
+            # кольори, що з'являться лише в наступних кадрах, додаються до палітри заздалегідь
+            colors = image.quantize(128).getpalette()[:128 * 3]
+            if self.extra_colors is not None and len(self.extra_colors):
+                extra = np.asarray(self.extra_colors)[:, :3]
+                extra = extra[np.linspace(0, len(extra) - 1, min(len(extra), 128)).astype(int)]
+                colors += np.round(extra * 255).astype(int).ravel().tolist()
+            self._palette = Image.new("P", (1, 1))
+            self._palette.putpalette(colors + [0] * (768 - len(colors)))
+            frame = image.quantize(palette=self._palette, dither=Image.Dither.NONE)
+            header, _ = GifImagePlugin.getheader(frame, info={"loop": 0})
+            self._file = open(self.output, "wb")
+            self._file.writelines(header)
+        else:
+            frame = image.quantize(palette=self._palette, dither=Image.Dither.NONE)
+        self._file.writelines(GifImagePlugin.getdata(frame, duration=round(1000 / self.fps)))
+
+    def _start_ffmpeg(self, width, height):
+        """
+        Запускає ffmpeg, що читає сирі кадри RGBA зі стандартного входу та кодує їх у H.264.
+
+        Args:
+            width: Ширина кадру в пікселях.
+            height: Висота кадру в пікселях.
 
-if __name__ == "__main__":
+        Returns:
+            subprocess.Popen: Процес ffmpeg.
+        """
+        ffmpeg = shutil.which("ffmpeg")
+        if ffmpeg is None:
+            raise RuntimeError("Для запису MP4 потрібен ffmpeg у PATH")
+        return subprocess.Popen(
+            [ffmpeg, "-y", "-loglevel", "error", "-f", "rawvideo", "-pix_fmt", "rgba",
+             "-s", f"{width}x{height}", "-r", str(self.fps), "-i", "-",
+             "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2", "-pix_fmt", "yuv420p", str(self.output)],
+            stdin=subprocess.PIPE,
+        )
+
+    def close(self):
+        """
+        Завершує запис файлу.
+        """
+        if self._file is not None:
+            self._file.write(b";")
+            self._file.close()
+            self._file = None
+        if self._process is not None:
+            self._process.stdin.close()
+            if self._process.wait():
+                raise RuntimeError(f"ffmpeg завершився з кодом {self._process.returncode}")
+            self._process = None
+
+def animate_traversal(
+    heap, visit_order, output, colors=None, step=1, fps=10, max_depth=None,
+    title=None, figsize=(12, 8), dpi=80,
+):
+    """
+    Експортує анімацію обходу дерева без вікна.
+
+    Дерево малюється один раз. Для кожного кадру на вже готовий буфер Agg
+    домальовуються лише щойно відвідані вузли (та їхні підписи) через
+    ax.draw_artist, тож час кадру залежить від step, а не від розміру дерева.
+    Кадри записуються потоково. Їх кількість - не більше ceil(len(visit_order) / step) + 1:
+    кроки, усі вузли яких лежать у згорнутих піддеревах, кадрів не дають.
+
+    Args:
+        heap: Бінарне дерево у вигляді списку.
+        visit_order: Порядок відвідування вузлів у дереві.
+        output: Файл .gif або .mp4 (потрібен ffmpeg) чи каталог для кадрів PNG.
+        colors: Кольори відвідуваних вузлів (за замовчуванням - gradient).
+        step: Кількість вузлів, що додаються за один кадр.
+        fps: Кількість кадрів на секунду.
+        max_depth: Найбільша глибина, що малюється повністю; глибші рівні згортаються.
+        title: Заголовок рисунка.
+        figsize: Розмір рисунка в дюймах.
+        dpi: Роздільність кадрів.
+
+    Returns:
+        int: Кількість записаних кадрів.
+    """
+    fig = Figure(figsize=figsize, dpi=dpi)
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.subplots()
+    ax.axis("off")
+    if title:
+        ax.set_title(title)
+    indices, offsets, radii, line_widths, labels = draw_heap_tree(
+        heap, ax, max_depth=max_depth, facecolors="skyblue", edge_color="gray"
+    )
+    palette = to_rgba_array(gradient(len(visit_order)) if colors is None else colors)
+    # номер вузла серед намальованих (-1 для вузлів у згорнутих піддеревах)
+    slots = np.full(len(heap), -1, dtype=np.int64)
+    slots[indices] = np.arange(len(indices))
+
+    overlay = EllipseCollection(
+        [], [], 0, units="xy", offsets=np.empty((0, 2)), offset_transform=ax.transData,
+        edgecolors="black", zorder=4, animated=True,
+    )
+    ax.add_collection(overlay, autolim=False)
+    canvas.draw()
+
+    writer = _FrameWriter(output, fps, palette)
+    try:
+        writer.write(np.asarray(canvas.buffer_rgba()))
+        visit_order = np.asarray(visit_order, dtype=np.int64)
+        for start in range(0, len(visit_order), step):
+            batch = visit_order[start:start + step]
+            shown = slots[batch] >= 0
+            if not shown.any():
+                continue
+            drawn = slots[batch][shown]
+            overlay.set_offsets(offsets[drawn])
+            overlay.set_widths(2 * radii[drawn])
+            overlay.set_heights(2 * radii[drawn])
+            overlay.set_linewidths(line_widths[drawn])
+            overlay.set_facecolors(palette[start + np.flatnonzero(shown)])
+            ax.draw_artist(overlay)
+            for node in batch.tolist():
+                if node in labels:
+                    ax.draw_artist(labels[node])
+            writer.write(np.asarray(canvas.buffer_rgba()))
+    finally:
+        writer.close()
+    return writer.count
+
+if __name__ == "__main__" and "--benchmark" in sys.argv:
+    benchmark_traversals()
+elif __name__ == "__main__" and "--animate" in sys.argv:
+    data = [20, 18, 15, 30, 10, 5, 7, 9, 8, 2, 1, 4, 6, 66]
+    max_heap = MaxHeap(data)
+    animate_traversal(max_heap, dfs(max_heap), "dfs.gif", title="Візуалізація DFS", fps=2)
+    animate_traversal(max_heap, bfs(max_heap), "bfs.gif", title="Візуалізація BFS", fps=2)
+elif __name__ == "__main__":
     data = [20, 18, 15, 30, 10, 5, 7, 9, 8, 2, 1, 4, 6, 66]
-    max_heap = build_max_heap(data)
+    max_heap = MaxHeap(data)
 
     dfs_order = dfs(max_heap)
-    dfs_colors = [generate_color(i, len(dfs_order)) for i in range(len(dfs_order))]
+    dfs_colors = gradient(len(dfs_order))
 
     _, ax = plt.subplots(figsize=(12, 8))
     ax.axis("off")
@@ -197,7 +459,7 @@ if __name__ == "__main__":
     plt.show()
 
     bfs_order = bfs(max_heap)
-    bfs_colors = [generate_color(i, len(bfs_order)) for i in range(len(bfs_order))]
+    bfs_colors = gradient(len(bfs_order))
 
     _, ax = plt.subplots(figsize=(12, 8))
     ax.axis("off")
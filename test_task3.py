@@ -0,0 +1,82 @@
+import random
+
+import pytest
+
+from task3 import dijkstra, reverse_graph, shortest_path
+
+# граф з прикладу в task3.py
+README_GRAPH = {
+    "A": {"B": 5, "C": 10},
+    "B": {"A": 5, "D": 3},
+    "C": {"A": 10, "D": 2},
+    "D": {"B": 3, "C": 2, "E": 4},
+    "E": {"D": 4, "F": 2},
+    "F": {"E": 2},
+}
+
+
+def random_graph(rng, vertices, edges, max_weight=20):
+    """
+    Будує випадковий орієнтований граф; частина вершин може бути недосяжною.
+
+    Args:
+        rng: Генератор випадкових чисел.
+        vertices: Кількість вершин.
+        edges: Кількість спроб додати ребро.
+        max_weight: Найбільша вага ребра.
+
+    Returns:
+        dict: Граф у форматі словника з вагами ребер.
+    """
+    graph = {vertex: {} for vertex in range(vertices)}
+    for _ in range(edges):
+        node, neighbor = rng.randrange(vertices), rng.randrange(vertices)
+        if node != neighbor:
+            graph[node][neighbor] = rng.randint(1, max_weight)
+    return graph
+
+
+def check_path(graph, source, target, bidirectional, reverse=None):
+    """
+    Перевіряє shortest_path для однієї пари вершин за повним запуском dijkstra.
+
+    Args:
+        graph: Граф у форматі словника з вагами ребер.
+        source: Початкова вершина.
+        target: Кінцева вершина.
+        bidirectional: Режим пошуку shortest_path.
+        reverse: Попередньо обчислений обернений граф.
+    """
+    expected = dijkstra(graph, source)[target]
+    path, cost = shortest_path(graph, source, target, bidirectional=bidirectional, reverse=reverse)
+    assert cost == expected
+    if expected == float("infinity"):
+        assert path == []
+        return
+    assert path[0] == source and path[-1] == target
+    assert sum(graph[node][neighbor] for node, neighbor in zip(path, path[1:])) == cost
+
+
+@pytest.mark.parametrize("bidirectional", [False, True])
+def test_readme_graph(bidirectional):
+    assert shortest_path(README_GRAPH, "A", "F", bidirectional=bidirectional) == (["A", "B", "D", "E", "F"], 14)
+    for source in README_GRAPH:
+        for target in README_GRAPH:
+            check_path(README_GRAPH, source, target, bidirectional)
+
+
+@pytest.mark.parametrize("bidirectional", [False, True])
+def test_random_graphs(bidirectional):
+    rng = random.Random(42)
+    for _ in range(300):
+        vertices = rng.randint(1, 40)
+        graph = random_graph(rng, vertices, rng.randint(0, vertices * 4))
+        reverse = reverse_graph(graph)
+        for _ in range(5):
+            check_path(graph, rng.randrange(vertices), rng.randrange(vertices), bidirectional, reverse)
+
+
+@pytest.mark.parametrize("bidirectional", [False, True])
+def test_unreachable_target(bidirectional):
+    graph = {"A": {"B": 1}, "B": {}, "C": {"A": 1}}
+    assert shortest_path(graph, "A", "C", bidirectional=bidirectional) == ([], float("infinity"))